@@ -60,17 +60,19 @@ function DeploymentInfo() {
     setLoading(true);
     setError('');
     try {
-      const [instanceResp, deploymentResp, networkResp, stressResp] = await Promise.all([
-        apiService.getInstanceMetadata(),
-        apiService.getDeploymentInfo(), 
-        apiService.getNetworkInfo(),
+      const [metadataResp, stressResp] = await Promise.all([
+        apiService.getMetadataSections(['instance', 'deployment', 'network']),
         apiService.getStressStatus()
       ]);
       
-      setInstanceData(instanceResp.data.data);
-      setDeploymentData(deploymentResp.data.data);
-      setNetworkData(networkResp.data.data);
+      const sections = metadataResp.data.data;
+      setInstanceData(sections.instance ?? null);
+      setDeploymentData(sections.deployment ?? null);
+      setNetworkData(sections.network ?? null);
       setStressStatus(stressResp.data.data);
+      if (metadataResp.data.errors) {
+        setError('Some deployment information could not be loaded');
+      }
       
     } catch (err) {
       console.error('Error loading deployment data:', err);
@@ -418,6 +420,7 @@ function DeploymentInfo() {
                 <MenuItem value="cpu">CPU Stress</MenuItem>
                 <MenuItem value="memory">Memory Stress</MenuItem>
                 <MenuItem value="mixed">Mixed (CPU + Memory)</MenuItem>
+                <MenuItem value="http">HTTP Load (other services)</MenuItem>
               </Select>
             </FormControl>
             
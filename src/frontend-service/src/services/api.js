@@ -61,6 +61,9 @@ export const apiService = {
   getInstanceMetadata: ensureReady(() => metadataApi.get('/api/metadata/instance')),
   getDeploymentInfo: ensureReady(() => metadataApi.get('/api/metadata/deployment')),
   getNetworkInfo: ensureReady(() => metadataApi.get('/api/metadata/network')),
+  getMetadataSections: ensureReady((sections, fields) => metadataApi.get('/api/metadata', {
+    params: { sections: sections?.join(','), fields: fields?.join(',') }
+  })),
   startStressTest: ensureReady((duration, stressType = 'cpu') => {
     return metadataApi.post('/api/stress/start', {
       duration: duration * 60, // Convert minutes to seconds
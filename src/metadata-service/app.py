@@ -1,18 +1,28 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request
 from flask_cors import CORS
-import logging
+from functools import wraps
+import hmac
+import pstats
 import os
 from datetime import datetime
 import threading
-import time
 
-from services.metadata_service import MetadataService
+from services.metadata_service import MetadataService, SECTIONS
 from services.stress_service import StressService
 from services.environment_detector import EnvironmentDetector
-from utils.logger import setup_logger
+from services.profiler import StackSampler, RequestProfiler, ProfilerBusyError
+from services.runtime_stats import RuntimeStats
+from services.stress_runs import StressRun, StressRunStore
+from services.admission import AdmissionController, parse_limits
+from services.health import HealthChecker
+from utils.logger import setup_logger, get_log_stats
+from utils.serializer import FastJSONProvider, envelope_response
+from utils.compression import compress_response
 from config.settings import Config
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
+app.after_request(compress_response)
 CORS(app)
 
 # Setup logging
@@ -22,32 +32,125 @@ logger = setup_logger(__name__)
 metadata_service = MetadataService()
 stress_service = StressService()
 env_detector = EnvironmentDetector()
+runtime_stats = RuntimeStats(stress_service)
+stress_run_store = StressRunStore()
+health_checker = HealthChecker(metadata_service, runtime_stats)
+metadata_service.system_sampler = health_checker
+admission = AdmissionController(
+    max_concurrent=Config.ADMISSION_MAX_CONCURRENT,
+    default_route_limit=Config.ADMISSION_DEFAULT_ROUTE_LIMIT,
+    route_limits=parse_limits(Config.ADMISSION_ROUTE_LIMITS),
+    priority_routes=[route.strip() for route in Config.ADMISSION_PRIORITY_ROUTES.split(',') if route.strip()],
+    priority_limit=Config.ADMISSION_PRIORITY_LIMIT,
+    queue_timeout=Config.ADMISSION_QUEUE_TIMEOUT
+)
+stack_sampler = StackSampler()
+request_profiler = RequestProfiler(Config.PROFILING_REQUEST_RATE, busy=lambda: bool(stress_service.stress_workers))
 
 # Global stress test state
-stress_state = {
+IDLE_STRESS_STATE = {
     'active': False,
     'start_time': None,
     'duration': 0,
-    'type': None
+    'type': None,
+    'run': None,
+    'finishing': False
 }
+stress_state = dict(IDLE_STRESS_STATE)
+# Guards every stress_state transition
+stress_state_lock = threading.Lock()
+
+def _update_run_state(current, changes):
+    """Apply changes to stress_state if current is still the current run"""
+    global stress_state
+    with stress_state_lock:
+        if stress_state['run'] is current:
+            stress_state = {**stress_state, **changes}
+
+@app.before_request
+def admit_request():
+    """Shed requests with 503 when their route or the worker is saturated"""
+    if not Config.ADMISSION_ENABLED:
+        return None
+    
+    route = request.url_rule.rule if request.url_rule else '<unmatched>'
+    g.admission_slot = admission.acquire(route)
+    if g.admission_slot is None:
+        response = jsonify({
+            'success': False,
+            'error': 'Service saturated, retry later',
+            'path': request.path
+        })
+        response.status_code = 503
+        response.headers['Retry-After'] = str(Config.ADMISSION_RETRY_AFTER)
+        return response
+    return None
+
+@app.teardown_request
+def release_admission(error=None):
+    slot = g.pop('admission_slot', None)
+    if slot is not None:
+        admission.release(slot)
+
+@app.before_request
+def start_request_profile():
+    """Profile a sampled fraction of requests"""
+    runtime_stats.ensure_publisher()
+    g.profile = request_profiler.start()
+
+@app.teardown_request
+def stop_request_profile(error=None):
+    if 'profile' in g:
+        route = request.url_rule.rule if request.url_rule else request.path
+        request_profiler.stop(g.pop('profile'), f"{request.method} {route}")
 
 @app.route('/api/metadata/health', methods=['GET'])
 def health_check():
-    """Health check endpoint"""
+    """Health check endpoint, served from the background system sample"""
     try:
-        system_info = metadata_service.get_system_info()
+        health_checker.ensure_sampler()
+        system_info = health_checker.system or metadata_service.get_system_info()
         return jsonify({
             'status': 'UP',
             'timestamp': datetime.utcnow().isoformat() + 'Z',
             'service': {
                 'name': 'metadata-service',
                 'version': '1.0.0',
-                'environment': env_detector.detect_environment()
+                'environment': metadata_service.environment
             },
-            'system': system_info
+            'system': system_info,
+            'sample_age_seconds': _round_age(health_checker.sampler_age())
         }), 200
     except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
+        logger.error("Health check failed: %s", e)
+        return jsonify({
+            'status': 'DOWN',
+            'error': str(e)
+        }), 500
+
+def _round_age(age):
+    return None if age is None else round(age, 2)
+
+def _health_response(result):
+    return jsonify(result), 503 if result['status'] == 'DOWN' else 200
+
+@app.route('/api/metadata/health/live', methods=['GET'])
+def liveness_check():
+    """Liveness probe: in-memory only"""
+    return _health_response(health_checker.liveness())
+
+@app.route('/api/metadata/health/ready', methods=['GET'])
+def readiness_check():
+    """Readiness probe: cached upstream status and sampler freshness"""
+    return _health_response(health_checker.readiness())
+
+@app.route('/api/metadata/health/deep', methods=['GET'])
+def deep_health_check():
+    """Diagnostic check that calls the upstreams"""
+    try:
+        return _health_response(health_checker.deep())
+    except Exception as e:
+        logger.error("Deep health check failed: %s", e)
         return jsonify({
             'status': 'DOWN',
             'error': str(e)
@@ -60,14 +163,14 @@ def get_instance_metadata():
         logger.info("Fetching instance metadata")
         metadata = metadata_service.get_instance_metadata()
         
-        return jsonify({
-            'success': True,
-            'data': metadata,
-            'timestamp': datetime.utcnow().isoformat() + 'Z'
-        }), 200
+        return envelope_response(
+            metadata,
+            cache_key='instance',
+            success=True
+        )
         
     except Exception as e:
-        logger.error(f"Error fetching instance metadata: {str(e)}")
+        logger.error("Error fetching instance metadata: %s", e)
         return jsonify({
             'success': False,
             'error': str(e),
@@ -81,14 +184,14 @@ def get_deployment_info():
         logger.info("Fetching deployment information")
         deployment_info = metadata_service.get_deployment_info()
         
-        return jsonify({
-            'success': True,
-            'data': deployment_info,
-            'timestamp': datetime.utcnow().isoformat() + 'Z'
-        }), 200
+        return envelope_response(
+            deployment_info,
+            cache_key='deployment',
+            success=True
+        )
         
     except Exception as e:
-        logger.error(f"Error fetching deployment info: {str(e)}")
+        logger.error("Error fetching deployment info: %s", e)
         return jsonify({
             'success': False,
             'error': str(e),
@@ -109,7 +212,95 @@ def get_network_info():
         }), 200
         
     except Exception as e:
-        logger.error(f"Error fetching network info: {str(e)}")
+        logger.error("Error fetching network info: %s", e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/metadata', methods=['GET'])
+def get_metadata_sections():
+    """Get several metadata sections in one round-trip
+
+    ?sections=instance,network selects sections (default: all) and
+    ?fields=instance.region,primary_ip limits the fields returned; a bare
+    field name applies to every requested section.
+    """
+    try:
+        sections = _split_param(request.args.get('sections')) or list(SECTIONS)
+        unknown = [section for section in sections if section not in SECTIONS]
+        if unknown:
+            return jsonify({
+                'success': False,
+                'error': f"Unknown sections: {', '.join(unknown)}",
+                'available_sections': list(SECTIONS)
+            }), 400
+
+        fields = {}
+        for field in _split_param(request.args.get('fields')):
+            section, _, name = field.rpartition('.')
+            targets = [section] if section else sections
+            for target in targets:
+                fields.setdefault(target, set()).add(name)
+
+        data, errors = metadata_service.get_sections(sections, fields)
+
+        response = {
+            'success': not errors,
+            'data': data,
+            'timestamp': datetime.utcnow().isoformat() + 'Z'
+        }
+        if errors:
+            response['errors'] = errors
+        return jsonify(response), 200
+
+    except Exception as e:
+        logger.error("Error fetching metadata sections: %s", e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def _split_param(value):
+    """Split a comma separated query parameter"""
+    return [item.strip() for item in (value or '').split(',') if item.strip()]
+
+@app.route('/api/metadata/logging', methods=['GET'])
+def get_logging_stats():
+    """Get logging pipeline counters"""
+    return jsonify({
+        'success': True,
+        'data': get_log_stats()
+    }), 200
+
+@app.route('/api/metadata/admission', methods=['GET'])
+def get_admission_stats():
+    """Get admission control counters and queue wait for this worker"""
+    return jsonify({
+        'success': True,
+        'data': {
+            'pid': os.getpid(),
+            **admission.stats()
+        }
+    }), 200
+
+@app.route('/api/metadata/runtime', methods=['GET'])
+def get_runtime_stats():
+    """Runtime stats for this worker, or every worker in the pod with ?scope=pod"""
+    try:
+        if request.args.get('scope') == 'pod':
+            data = runtime_stats.aggregate()
+        else:
+            data = runtime_stats.snapshot()
+        
+        return jsonify({
+            'success': True,
+            'data': data,
+            'timestamp': datetime.utcnow().isoformat() + 'Z'
+        }), 200
+        
+    except Exception as e:
+        logger.error("Error getting runtime stats: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -120,49 +311,85 @@ def start_stress_test():
     """Start stress test"""
     try:
         global stress_state
-        data = request.get_json()
+        data = request.get_json(silent=True)
+        if data is None:
+            data = {}
+        if not isinstance(data, dict):
+            return jsonify({
+                'success': False,
+                'error': 'Request body must be a JSON object'
+            }), 400
         duration = data.get('duration', 300)  # Default 5 minutes
-        stress_type = data.get('type', 'cpu')  # cpu, memory, or mixed
+        stress_type = data.get('type', 'cpu')  # cpu, memory, mixed or http
         
-        if stress_state['active']:
+        try:
+            options = stress_service.validate_options(stress_type, data)
+        except (TypeError, ValueError) as e:
             return jsonify({
                 'success': False,
-                'message': 'Stress test already running'
+                'error': str(e)
             }), 400
         
-        logger.info(f"Starting {stress_type} stress test for {duration} seconds")
-        
-        # Start stress test in background thread
-        def run_stress():
+        run = StressRun(stress_type, duration, stress_run_store,
+                        params={'duration': duration, 'type': stress_type, **options})
+        with stress_state_lock:
+            if stress_state['active'] or stress_state['finishing']:
+                message = ('Stress test already running' if stress_state['active']
+                           else 'Previous stress test is still finishing')
+                return jsonify({
+                    'success': False,
+                    'message': message
+                }), 400
             stress_state = {
                 'active': True,
                 'start_time': datetime.utcnow(),
                 'duration': duration,
-                'type': stress_type
-            }
-            
-            stress_service.start_stress(stress_type, duration)
-            
-            stress_state = {
-                'active': False,
-                'start_time': None,
-                'duration': 0,
-                'type': None
+                'type': stress_type,
+                'run': run,
+                'finishing': False
             }
+            # Arm the stop event now so a stop during the 'before' probes is honoured
+            stress_service.prepare()
         
-        thread = threading.Thread(target=run_stress)
-        thread.daemon = True
-        thread.start()
+        logger.info("Starting %s stress test for %s seconds", stress_type, duration)
+        
+        # Start stress test in background thread
+        def run_stress():
+            try:
+                run.probe_phase('before')
+                if run.status == 'stopped' or stress_service.stop_requested():
+                    run.stop('stopped')
+                else:
+                    run.start()
+                    stress_service.start_stress(stress_type, duration, options)
+                    run.stop('completed')
+            except Exception:
+                run.stop('failed')
+                raise
+            finally:
+                if stress_type == 'http':
+                    run.results = stress_service.get_http_stats()
+                # Block new runs until the 'after' probes are done
+                _update_run_state(run, {'active': False, 'finishing': True})
+                try:
+                    run.probe_phase('after')
+                    run.finish()
+                    logger.info("Stress run %s %s", run.id, run.status)
+                finally:
+                    _update_run_state(run, IDLE_STRESS_STATE)
+        
+        stress_service.spawn_worker('runner', run_stress)
         
         return jsonify({
             'success': True,
             'message': f'{stress_type.title()} stress test started',
             'duration_seconds': duration,
-            'stress_type': stress_type
+            'stress_type': stress_type,
+            'run_id': run.id
         }), 200
         
     except Exception as e:
-        logger.error(f"Error starting stress test: {str(e)}")
+        logger.error("Error starting stress test: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -176,6 +403,7 @@ def get_stress_status():
         
         stress_info = {
             'active': stress_state['active'],
+            'finishing': stress_state['finishing'],
             'metrics': current_metrics
         }
         
@@ -188,7 +416,8 @@ def get_stress_status():
                 'duration': stress_state['duration'],
                 'elapsed_seconds': int(elapsed),
                 'remaining_seconds': int(remaining),
-                'type': stress_state['type']
+                'type': stress_state['type'],
+                'run_id': stress_state['run'].id if stress_state['run'] else None
             })
         
         return jsonify({
@@ -197,7 +426,7 @@ def get_stress_status():
         }), 200
         
     except Exception as e:
-        logger.error(f"Error getting stress status: {str(e)}")
+        logger.error("Error getting stress status: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -208,21 +437,19 @@ def stop_stress_test():
     """Stop current stress test"""
     global stress_state
     try:
-        if not stress_state['active']:
-            return jsonify({
-                'success': False,
-                'message': 'No active stress test to stop'
-            }), 400
+        with stress_state_lock:
+            if not stress_state['active']:
+                return jsonify({
+                    'success': False,
+                    'message': 'No active stress test to stop'
+                }), 400
+            
+            # The runner resets the state once the run's 'after' probes are done
+            stress_state['run'].mark('stopped')
+            stress_state = {**stress_state, 'active': False, 'finishing': True}
         
         stress_service.stop_stress()
         
-        stress_state = {
-            'active': False,
-            'start_time': None,
-            'duration': 0,
-            'type': None
-        }
-        
         logger.info("Stress test stopped manually")
         
         return jsonify({
@@ -231,12 +458,171 @@ def stop_stress_test():
         }), 200
         
     except Exception as e:
-        logger.error(f"Error stopping stress test: {str(e)}")
+        logger.error("Error stopping stress test: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+@app.route('/api/stress/runs', methods=['GET'])
+def list_stress_runs():
+    """List recorded stress runs, newest first"""
+    try:
+        limit = int(request.args.get('limit', 20))
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'limit must be an integer'
+        }), 400
+    
+    try:
+        return jsonify({
+            'success': True,
+            'data': stress_run_store.list(limit)
+        }), 200
+        
+    except Exception as e:
+        logger.error("Error listing stress runs: %s", e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/stress/runs/<run_id>', methods=['GET'])
+def get_stress_run(run_id):
+    """Get a recorded stress run with its time series"""
+    run = stress_run_store.get(run_id)
+    if run is None:
+        return jsonify({
+            'success': False,
+            'error': f'Stress run {run_id} not found'
+        }), 404
+    return jsonify({
+        'success': True,
+        'data': run
+    }), 200
+
+def require_profiling_auth(view):
+    """Only serve profiling endpoints when enabled and given the bearer token"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not Config.PROFILING_ENABLED or not Config.PROFILING_TOKEN:
+            return not_found(None)
+        
+        token = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+        if not hmac.compare_digest(token.encode(), Config.PROFILING_TOKEN.encode()):
+            return jsonify({
+                'success': False,
+                'error': 'Invalid profiling token'
+            }), 401
+        return view(*args, **kwargs)
+    return wrapper
+
+@app.route('/api/profile/stacks', methods=['GET'])
+@require_profiling_auth
+def profile_stacks():
+    """Sample this worker's stacks for N seconds
+
+    ?seconds=10&interval=0.01&format=collapsed|json. The collapsed output
+    can be fed straight to flamegraph.pl or speedscope.
+    """
+    try:
+        seconds = min(float(request.args.get('seconds', 10)), Config.PROFILING_MAX_SECONDS)
+        interval = max(float(request.args.get('interval', Config.PROFILING_SAMPLE_INTERVAL)), 0.001)
+        output = request.args.get('format', 'collapsed')
+        
+        stacks, samples = stack_sampler.sample(seconds, interval)
+        
+        if output == 'json':
+            return jsonify({
+                'success': True,
+                'data': {
+                    'pid': os.getpid(),
+                    'seconds': seconds,
+                    'interval': interval,
+                    'samples': samples,
+                    'stacks': dict(stacks.most_common())
+                }
+            }), 200
+        
+        response = Response(StackSampler.format_collapsed(stacks), mimetype='text/plain')
+        response.headers['X-Profile-Pid'] = str(os.getpid())
+        response.headers['X-Profile-Samples'] = str(samples)
+        return response
+        
+    except ProfilerBusyError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 409
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@app.route('/api/profile/requests', methods=['GET'])
+@require_profiling_auth
+def profile_requests():
+    """Per-route cProfile stats; ?route=GET /api/metadata/instance for a report"""
+    route = request.args.get('route')
+    if route is None:
+        return jsonify({
+            'success': True,
+            'data': {
+                'pid': os.getpid(),
+                'rate': request_profiler.rate,
+                'routes': request_profiler.routes()
+            }
+        }), 200
+    
+    sort = request.args.get('sort', 'cumulative')
+    try:
+        limit = int(request.args.get('limit', 30))
+    except ValueError:
+        limit = None
+    if limit is None or limit <= 0 or sort not in pstats.Stats.sort_arg_dict_default:
+        return jsonify({
+            'success': False,
+            'error': 'limit must be a positive integer and sort a pstats sort key'
+        }), 400
+    
+    report = request_profiler.report(route, sort=sort, limit=limit)
+    if report is None:
+        return jsonify({
+            'success': False,
+            'error': f'No profiles collected for {route}'
+        }), 404
+    return Response(report, mimetype='text/plain')
+
+@app.route('/api/profile/requests', methods=['PUT'])
+@require_profiling_auth
+def configure_request_profiling():
+    """Change the per-request sampling rate, optionally clearing stats"""
+    data = request.get_json(silent=True) or {}
+    try:
+        rate = float(data.get('rate', request_profiler.rate))
+    except (TypeError, ValueError):
+        rate = -1
+    if not 0 <= rate <= 1:
+        return jsonify({
+            'success': False,
+            'error': 'rate must be between 0 and 1'
+        }), 400
+    
+    request_profiler.rate = rate
+    if data.get('reset'):
+        request_profiler.reset()
+    
+    logger.info("Request profiling rate set to %s in worker %d", rate, os.getpid())
+    return jsonify({
+        'success': True,
+        'data': {
+            'pid': os.getpid(),
+            'rate': rate
+        }
+    }), 200
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({
@@ -247,7 +633,7 @@ def not_found(error):
 
 @app.errorhandler(500)
 def internal_error(error):
-    logger.error(f"Internal server error: {str(error)}")
+    logger.error("Internal server error: %s", error)
     return jsonify({
         'success': False,
         'error': 'Internal server error'
@@ -256,8 +642,7 @@ def internal_error(error):
 if __name__ == '__main__':
     port = int(os.environ.get('METADATA_SERVICE_PORT'))
     debug = os.environ.get('FLASK_ENV') == 'development'
-    logger.info("Running on port %d", port)
-    logger.info(f"Starting Metadata Service on port {port}")
-    logger.info(f"Environment: {env_detector.detect_environment()}")
+    logger.info("Starting Metadata Service on port %d", port)
+    logger.info("Environment: %s", env_detector.detect_environment())
     
     app.run(host='0.0.0.0', port=port, debug=debug)
\ No newline at end of file
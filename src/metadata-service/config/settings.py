@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -21,3 +22,87 @@ class Config:
     KUBERNETES_NAMESPACE = os.environ.get('POD_NAMESPACE', 'default')
     NODE_NAME = os.environ.get('NODE_NAME')
     POD_NAME = os.environ.get('HOSTNAME')
+    POD_IP = os.environ.get('POD_IP')  # Downward API status.podIP
+    
+    # Seconds between address rediscovery when netlink notifications are unavailable
+    ADDRESS_REFRESH_INTERVAL = int(os.environ.get('ADDRESS_REFRESH_INTERVAL', 300))
+
+    # Response settings
+    JSON_SERIALIZER = os.environ.get('JSON_SERIALIZER', 'orjson')  # orjson or json
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))
+    GZIP_LEVEL = int(os.environ.get('GZIP_LEVEL', 6))
+    BROTLI_QUALITY = int(os.environ.get('BROTLI_QUALITY', 4))
+
+    # Metadata cache settings
+    METADATA_CACHE_TTL = int(os.environ.get('METADATA_CACHE_TTL', 30))
+    METADATA_CACHE_CONTROL = os.environ.get('METADATA_CACHE_CONTROL', 'no-cache')
+    METADATA_STALE_TTL = int(os.environ.get('METADATA_STALE_TTL', 10))
+    METADATA_SNAPSHOT_PATH = os.environ.get('METADATA_SNAPSHOT_PATH', os.path.join(tempfile.gettempdir(), 'metadata-service-snapshot.json'))
+
+    # Logging settings
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_LEVELS = os.environ.get('LOG_LEVELS', '')  # e.g. services.stress_service=WARNING,app=DEBUG
+    LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')  # json or text
+    LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+    LOG_RATE_LIMIT = int(os.environ.get('LOG_RATE_LIMIT', 20))  # per call site per window, 0 disables
+    LOG_RATE_WINDOW = float(os.environ.get('LOG_RATE_WINDOW', 10))
+
+    # Profiling settings (endpoints are disabled unless PROFILING_ENABLED and a token are set)
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'false').lower() == 'true'
+    PROFILING_TOKEN = os.environ.get('PROFILING_TOKEN')
+    PROFILING_MAX_SECONDS = int(os.environ.get('PROFILING_MAX_SECONDS', 60))
+    PROFILING_SAMPLE_INTERVAL = float(os.environ.get('PROFILING_SAMPLE_INTERVAL', 0.01))
+    PROFILING_REQUEST_RATE = float(os.environ.get('PROFILING_REQUEST_RATE', 0.0))
+
+    # Runtime stats settings
+    RUNTIME_STATS_DIR = os.environ.get('RUNTIME_STATS_DIR', os.path.join(tempfile.gettempdir(), 'metadata-service-runtime'))
+    RUNTIME_STATS_INTERVAL = float(os.environ.get('RUNTIME_STATS_INTERVAL', 5))
+    RUNTIME_STATS_COUNT_OBJECTS = os.environ.get('RUNTIME_STATS_COUNT_OBJECTS', 'false').lower() == 'true'
+
+    # Stress run report settings
+    STRESS_RUNS_PATH = os.environ.get('STRESS_RUNS_PATH', os.path.join(tempfile.gettempdir(), 'metadata-service-stress-runs.jsonl'))
+    STRESS_SAMPLE_INTERVAL = float(os.environ.get('STRESS_SAMPLE_INTERVAL', 1))
+    SELF_PROBE_BASE_URL = os.environ.get(
+        'SELF_PROBE_BASE_URL',
+        f"http://127.0.0.1:{os.environ.get('METADATA_SERVICE_PORT', PORT)}"
+    )
+    SELF_PROBE_ROUNDS = int(os.environ.get('SELF_PROBE_ROUNDS', 5))
+    SELF_PROBE_TIMEOUT = float(os.environ.get('SELF_PROBE_TIMEOUT', 2))
+
+    # HTTP stress settings; targets are 'url' or 'url|weight', comma separated
+    HTTP_STRESS_TARGETS = os.environ.get(
+        'HTTP_STRESS_TARGETS',
+        'http://auth-service:8082/api/auth/health,'
+        'http://login-service:8081/api/login/health,'
+        'http://notification-service:8083/api/notifications/health'
+    )
+    HTTP_STRESS_RPS = float(os.environ.get('HTTP_STRESS_RPS', 50))
+    HTTP_STRESS_MAX_RPS = float(os.environ.get('HTTP_STRESS_MAX_RPS', 2000))
+    HTTP_STRESS_CONCURRENCY = int(os.environ.get('HTTP_STRESS_CONCURRENCY', 32))
+    HTTP_STRESS_MAX_CONCURRENCY = int(os.environ.get('HTTP_STRESS_MAX_CONCURRENCY', 256))
+    HTTP_STRESS_TIMEOUT = float(os.environ.get('HTTP_STRESS_TIMEOUT', 5))
+    HTTP_STRESS_MAX_BACKLOG = int(os.environ.get('HTTP_STRESS_MAX_BACKLOG', 10000))
+
+    # Admission control; MAX_CONCURRENT + PRIORITY_LIMIT should match the gunicorn threads per worker
+    ADMISSION_ENABLED = os.environ.get('ADMISSION_ENABLED', 'true').lower() == 'true'
+    ADMISSION_MAX_CONCURRENT = int(os.environ.get('ADMISSION_MAX_CONCURRENT', 6))
+    ADMISSION_DEFAULT_ROUTE_LIMIT = int(os.environ.get('ADMISSION_DEFAULT_ROUTE_LIMIT', 4))
+    ADMISSION_ROUTE_LIMITS = os.environ.get(
+        'ADMISSION_ROUTE_LIMITS',
+        '/api/metadata/instance=3,/api/metadata=3,/api/profile/stacks=1,/api/metadata/health/deep=1'
+    )
+    ADMISSION_PRIORITY_ROUTES = os.environ.get(
+        'ADMISSION_PRIORITY_ROUTES',
+        '/api/metadata/health,/api/metadata/health/live,/api/metadata/health/ready'
+    )
+    ADMISSION_PRIORITY_LIMIT = int(os.environ.get('ADMISSION_PRIORITY_LIMIT', 2))
+    ADMISSION_QUEUE_TIMEOUT = float(os.environ.get('ADMISSION_QUEUE_TIMEOUT', 0.25))
+    ADMISSION_RETRY_AFTER = int(os.environ.get('ADMISSION_RETRY_AFTER', 1))
+
+    # Health check tiers; budgets are in seconds
+    HEALTH_LIVENESS_BUDGET = float(os.environ.get('HEALTH_LIVENESS_BUDGET', 0.5))
+    HEALTH_READINESS_BUDGET = float(os.environ.get('HEALTH_READINESS_BUDGET', 0.25))
+    HEALTH_DEEP_BUDGET = float(os.environ.get('HEALTH_DEEP_BUDGET', 3))
+    HEALTH_UPSTREAM_TIMEOUT = float(os.environ.get('HEALTH_UPSTREAM_TIMEOUT', 1))
+    HEALTH_SAMPLE_INTERVAL = float(os.environ.get('HEALTH_SAMPLE_INTERVAL', 5))
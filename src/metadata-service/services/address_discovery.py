@@ -0,0 +1,196 @@
+import ipaddress
+import os
+import socket
+import threading
+import time
+
+import psutil
+
+from config.settings import Config
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+ROUTE_TABLE = '/proc/net/route'
+RTF_UP = 0x1
+
+# rtnetlink multicast groups: link, IPv4/IPv6 address and IPv4 route changes
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV4_ROUTE = 0x40
+RTMGRP_IPV6_IFADDR = 0x100
+
+
+class AddressDiscovery:
+    """Primary IP and interface discovery, cached until the network changes
+
+    The primary IP is, in order of preference: the downward-API pod IP, the
+    address of the interface carrying the default route, the first address of
+    any other interface that is up, and finally 127.0.0.1. Results are kept
+    until a netlink notification reports a link, address or route change, or,
+    where netlink is unavailable, until ADDRESS_REFRESH_INTERVAL elapses.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._primary_ip = None
+        self._interfaces = None
+        self._refreshed_at = 0.0
+        self._dirty = True
+        self._watcher_pid = None
+        self._netlink = False
+
+    def get_primary_ip(self):
+        """Get the primary private IP address"""
+        self._ensure_fresh()
+        return self._primary_ip
+
+    def get_interfaces(self):
+        """Get interfaces with their IPv4/IPv6 addresses"""
+        self._ensure_fresh()
+        return self._interfaces
+
+    def invalidate(self):
+        """Force the next lookup to rediscover addresses"""
+        self._dirty = True
+
+    def _ensure_fresh(self):
+        if self._watcher_pid != os.getpid():
+            with self._lock:
+                if self._watcher_pid != os.getpid():
+                    self._start_watcher()
+
+        if not self._stale():
+            return
+
+        with self._lock:
+            # Another thread may have refreshed while we waited
+            if self._stale():
+                self._refresh()
+
+    def _stale(self):
+        expired = (not self._netlink and
+                   time.monotonic() - self._refreshed_at >= Config.ADDRESS_REFRESH_INTERVAL)
+        return self._dirty or expired
+
+    def _refresh(self):
+        # Clear first so a change arriving mid-refresh triggers another one
+        self._dirty = False
+        addresses = psutil.net_if_addrs()
+        self._interfaces = self._describe_interfaces(addresses)
+        self._primary_ip = self._discover_primary_ip(addresses)
+        self._refreshed_at = time.monotonic()
+        logger.info("Primary IP resolved to %s", self._primary_ip)
+
+    def _discover_primary_ip(self, addresses):
+        """Work out the primary IP without touching the network"""
+        if Config.POD_IP:
+            return Config.POD_IP
+
+        default_iface = self._default_route_interface()
+        if default_iface:
+            ip = self._first_ipv4(addresses.get(default_iface, []))
+            if ip:
+                return ip
+
+        try:
+            stats = psutil.net_if_stats()
+        except Exception:
+            stats = {}
+        for name, addrs in addresses.items():
+            if name in stats and not stats[name].isup:
+                continue
+            ip = self._first_ipv4(addrs)
+            if ip:
+                return ip
+
+        return '127.0.0.1'
+
+    def _default_route_interface(self):
+        """Interface of the lowest-metric IPv4 default route, if any"""
+        try:
+            with open(ROUTE_TABLE) as f:
+                lines = f.readlines()[1:]
+        except OSError:
+            return None
+
+        best, best_metric = None, None
+        for line in lines:
+            fields = line.split()
+            if len(fields) < 7:
+                continue
+            iface, destination, flags, metric = fields[0], fields[1], int(fields[3], 16), int(fields[6])
+            if destination != '00000000' or not flags & RTF_UP:
+                continue
+            if best_metric is None or metric < best_metric:
+                best, best_metric = iface, metric
+        return best
+
+    def _first_ipv4(self, addrs):
+        """First non-loopback, non-link-local IPv4 address in a list"""
+        for addr in addrs:
+            if addr.family != socket.AF_INET:
+                continue
+            ip = ipaddress.ip_address(addr.address)
+            if not (ip.is_loopback or ip.is_link_local):
+                return addr.address
+        return None
+
+    def _describe_interfaces(self, addresses):
+        network_interfaces = []
+
+        for interface, addrs in addresses.items():
+            interface_info = {
+                'name': interface,
+                'addresses': []
+            }
+
+            for addr in addrs:
+                if addr.family == socket.AF_INET:  # IPv4
+                    interface_info['addresses'].append({
+                        'type': 'IPv4',
+                        'address': addr.address,
+                        'netmask': addr.netmask
+                    })
+                elif addr.family == socket.AF_INET6:  # IPv6
+                    interface_info['addresses'].append({
+                        'type': 'IPv6',
+                        'address': addr.address,
+                        'netmask': addr.netmask
+                    })
+
+            if interface_info['addresses']:
+                network_interfaces.append(interface_info)
+
+        return network_interfaces
+
+    def _start_watcher(self):
+        """Subscribe to rtnetlink change notifications in this process; call under _lock"""
+        self._watcher_pid = os.getpid()
+        self._dirty = True
+        self._netlink = False
+
+        if not hasattr(socket, 'AF_NETLINK'):
+            return
+
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+            sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV4_ROUTE | RTMGRP_IPV6_IFADDR))
+        except OSError as e:
+            logger.warning("Netlink unavailable, refreshing addresses periodically: %s", e)
+            return
+
+        thread = threading.Thread(target=self._watch, args=(sock,), name='address-watcher')
+        thread.daemon = True
+        thread.start()
+        self._netlink = True
+
+    def _watch(self, sock):
+        while True:
+            try:
+                sock.recv(65536)
+            except OSError as e:
+                logger.warning("Netlink watcher stopped: %s", e)
+                self._netlink = False
+                return
+            self._dirty = True
@@ -0,0 +1,135 @@
+import threading
+import time
+from collections import Counter
+
+from .load_generator import LatencyHistogram
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def parse_limits(spec):
+    """Parse '/api/metadata/instance=4,/api/metadata=2' into a dict"""
+    limits = {}
+    for item in spec.split(','):
+        route, _, limit = item.strip().rpartition('=')
+        if route and limit.strip().isdigit():
+            limits[route.strip()] = int(limit)
+    return limits
+
+
+class Slot:
+    """Semaphores held by an admitted request, released when it finishes"""
+
+    def __init__(self, route, semaphores):
+        self.route = route
+        self.semaphores = semaphores
+
+
+class AdmissionController:
+    """Per-route concurrency limits with a priority lane and fast shedding
+
+    Regular requests need a slot in the shared pool and on their route;
+    priority routes (health and readiness probes) use a separate pool so they
+    are never queued behind slow traffic. The shared slot is taken without
+    waiting, so requests queued for a route slot count against the shared
+    pool too and regular traffic never ties up more than max_concurrent
+    server threads. A request that cannot get its slots within the queue
+    deadline is shed instead of waiting.
+    """
+
+    def __init__(self, max_concurrent, default_route_limit, route_limits,
+                 priority_routes, priority_limit, queue_timeout):
+        self.queue_timeout = queue_timeout
+        self.default_route_limit = default_route_limit
+        self.route_limits = route_limits
+        self.priority_routes = set(priority_routes)
+        self._global = threading.BoundedSemaphore(max_concurrent)
+        self._priority = threading.BoundedSemaphore(priority_limit)
+        self._routes = {}
+        self._lock = threading.Lock()
+
+        self.limits = {
+            'max_concurrent': max_concurrent,
+            'default_route_limit': default_route_limit,
+            'route_limits': route_limits,
+            'priority_limit': priority_limit,
+            'queue_timeout_ms': round(queue_timeout * 1000)
+        }
+        self.admitted = Counter()
+        self.shed = Counter()
+        self.in_flight = Counter()
+        self.queue_wait = {}
+
+    def _route_semaphore(self, route):
+        semaphore = self._routes.get(route)
+        if semaphore is None:
+            with self._lock:
+                semaphore = self._routes.get(route)
+                if semaphore is None:
+                    limit = self.route_limits.get(route, self.default_route_limit)
+                    semaphore = threading.BoundedSemaphore(limit)
+                    self._routes[route] = semaphore
+        return semaphore
+
+    def acquire(self, route):
+        """Admit a request, returning a Slot, or None if it should be shed"""
+        start = time.perf_counter()
+        deadline = start + self.queue_timeout
+
+        if route in self.priority_routes:
+            needed = [(self._priority, True)]
+        else:
+            needed = [(self._global, False), (self._route_semaphore(route), True)]
+
+        held = []
+        for semaphore, wait in needed:
+            timeout = max(0.0, deadline - time.perf_counter()) if wait else 0
+            if not semaphore.acquire(timeout=timeout):
+                for acquired in held:
+                    acquired.release()
+                self._record(route, start, admitted=False)
+                return None
+            held.append(semaphore)
+
+        self._record(route, start, admitted=True)
+        return Slot(route, held)
+
+    def release(self, slot):
+        for semaphore in slot.semaphores:
+            semaphore.release()
+        with self._lock:
+            self.in_flight[slot.route] -= 1
+
+    def _record(self, route, start, admitted):
+        wait_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            histogram = self.queue_wait.get(route)
+            if histogram is None:
+                histogram = self.queue_wait[route] = LatencyHistogram()
+            histogram.record(wait_ms)
+            if admitted:
+                self.admitted[route] += 1
+                self.in_flight[route] += 1
+            else:
+                self.shed[route] += 1
+
+    def stats(self):
+        """Admitted, shed and in-flight counts plus queue wait per route"""
+        with self._lock:
+            routes = set(self.admitted) | set(self.shed)
+            return {
+                'limits': self.limits,
+                'admitted_total': sum(self.admitted.values()),
+                'shed_total': sum(self.shed.values()),
+                'routes': {
+                    route: {
+                        'admitted': self.admitted[route],
+                        'shed': self.shed[route],
+                        'in_flight': self.in_flight[route],
+                        'priority': route in self.priority_routes,
+                        'queue_wait': self.queue_wait[route].summary()
+                    }
+                    for route in sorted(routes)
+                }
+            }
@@ -33,7 +33,7 @@ class EnvironmentDetector:
             return False
             
         except Exception as e:
-            logger.debug(f"Error checking Kubernetes environment: {str(e)}")
+            logger.debug("Error checking Kubernetes environment: %s", e)
             return False
     
     def _is_aws(self):
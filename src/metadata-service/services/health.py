@@ -0,0 +1,217 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import psutil
+import requests
+from kubernetes import client
+
+from config.settings import Config
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+UPSTREAMS = {'aws': 'imds', 'kubernetes': 'apiserver', 'local': None}
+
+
+class HealthChecker:
+    """Tiered health checks with time budgets
+
+    Liveness and readiness only read state kept in memory: the cached upstream
+    status of the metadata service and a system snapshot refreshed by a
+    background sampler. They run inline and fail if they overrun their budget,
+    since an in-memory check that slow means the worker is starved. The deep
+    tier calls the upstreams and measures the system for real; its checks run
+    concurrently and any check still running when the budget ends is reported
+    as timed out.
+    """
+
+    def __init__(self, metadata_service, runtime_stats=None):
+        self.metadata_service = metadata_service
+        self.runtime_stats = runtime_stats
+        self.started_at = time.time()
+        self.system = None
+        self.sampled_at = None
+        self._sampler_pid = None
+        self._sampler_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='health')
+        self.ensure_sampler()
+
+    def ensure_sampler(self):
+        """Start the background system sampler in this process if needed"""
+        if self._sampler_pid == os.getpid():
+            return
+        with self._sampler_lock:
+            if self._sampler_pid == os.getpid():
+                return
+            self._sampler_pid = os.getpid()
+            thread = threading.Thread(target=self._sample_loop, name='health-sampler')
+            thread.daemon = True
+            thread.start()
+
+    def _sample_loop(self):
+        # Prime cpu_percent so every sample covers the interval since the last one
+        psutil.cpu_percent(interval=None)
+        while True:
+            try:
+                self._sample()
+            except Exception as e:
+                logger.warning("System sample failed: %s", e)
+            time.sleep(Config.HEALTH_SAMPLE_INTERVAL)
+
+    def _sample(self):
+        metadata_service = self.metadata_service
+        self.system = {
+            'cpu': {'count': psutil.cpu_count(), 'usage_percent': psutil.cpu_percent(interval=None)},
+            'memory': metadata_service._get_memory_info(),
+            'disk': metadata_service._get_disk_info(),
+            'load_average': os.getloadavg() if hasattr(os, 'getloadavg') else None
+        }
+        self.sampled_at = time.time()
+
+    def sampler_age(self):
+        """Seconds since the last system sample, or None before the first one"""
+        return None if self.sampled_at is None else time.time() - self.sampled_at
+
+    def liveness(self):
+        """The worker can run Python and answer; nothing outside the process is touched"""
+        return self._run_inline('liveness', Config.HEALTH_LIVENESS_BUDGET, {
+            'process': lambda: {
+                'status': 'ok',
+                'pid': os.getpid(),
+                'uptime_seconds': round(time.time() - self.started_at, 1),
+                'threads': threading.active_count()
+            }
+        })
+
+    def readiness(self):
+        """Metadata can be served and the sampler is fresh, from cached state only"""
+        self.ensure_sampler()
+        return self._run_inline('readiness', Config.HEALTH_READINESS_BUDGET, {
+            'upstreams': self._check_cached_upstreams,
+            'sampler': self._check_sampler
+        })
+
+    def deep(self):
+        """Live upstream calls and a fresh system measurement, for diagnostics"""
+        checks = {
+            'upstream': self._check_live_upstream,
+            'system': lambda: {'status': 'ok', **self.metadata_service.get_system_info(live=True)},
+            'upstreams_cached': self._check_cached_upstreams,
+            'sampler': self._check_sampler
+        }
+        if self.runtime_stats is not None:
+            checks['runtime'] = lambda: {'status': 'ok', **self.runtime_stats.snapshot()}
+        return self._run_concurrent('deep', Config.HEALTH_DEEP_BUDGET, checks)
+
+    def _check_cached_upstreams(self):
+        """Ready while every metadata key has a payload to serve
+
+        A failing upstream only degrades the check: the service keeps serving
+        the last-known-good snapshot or a fallback, and taking every replica
+        out of rotation when IMDS or the apiserver blips would be worse.
+        """
+        statuses = self.metadata_service.upstream_status()
+        status = 'ok'
+        for entry in statuses.values():
+            if entry['state'] == 'pending' and not entry['has_snapshot']:
+                status = 'fail'
+            elif entry['state'] != 'ok' and status == 'ok':
+                status = 'degraded'
+        return {
+            'status': status,
+            'upstream': UPSTREAMS.get(self.metadata_service.environment),
+            'keys': statuses
+        }
+
+    def _check_sampler(self):
+        age = self.sampler_age()
+        max_age = Config.HEALTH_SAMPLE_INTERVAL * 3
+        if age is None:
+            status = 'ok' if time.time() - self.started_at < max_age else 'fail'
+        else:
+            status = 'ok' if age <= max_age else 'fail'
+        return {
+            'status': status,
+            'age_seconds': None if age is None else round(age, 2),
+            'max_age_seconds': max_age
+        }
+
+    def _check_live_upstream(self):
+        environment = self.metadata_service.environment
+        upstream = UPSTREAMS.get(environment)
+        timeout = Config.HEALTH_UPSTREAM_TIMEOUT
+
+        if upstream == 'imds':
+            response = requests.put(
+                "http://169.254.169.254/latest/api/token",
+                headers={"X-aws-ec2-metadata-token-ttl-seconds": "60"},
+                timeout=timeout
+            )
+            response.raise_for_status()
+        elif upstream == 'apiserver':
+            k8s_client = self.metadata_service.k8s_client
+            if k8s_client is None:
+                return {'status': 'fail', 'upstream': upstream, 'error': 'Kubernetes client not initialized'}
+            client.VersionApi(k8s_client.api_client).get_code(_request_timeout=timeout)
+        return {'status': 'ok', 'upstream': upstream}
+
+    def _run_inline(self, tier, budget, checks):
+        """Run cheap in-memory checks in the calling thread, failing on overrun"""
+        start = time.perf_counter()
+        results = {}
+        for name, check in checks.items():
+            check_start = time.perf_counter()
+            try:
+                results[name] = check()
+            except Exception as e:
+                results[name] = {'status': 'fail', 'error': str(e)}
+            results[name]['duration_ms'] = _elapsed_ms(check_start)
+        return self._result(tier, budget, start, results)
+
+    def _run_concurrent(self, tier, budget, checks):
+        """Run checks on the health pool, abandoning any still running at the deadline"""
+        start = time.perf_counter()
+        results = {}
+
+        def timed(name, check):
+            check_start = time.perf_counter()
+            try:
+                result = check()
+            except Exception as e:
+                result = {'status': 'fail', 'error': str(e)}
+            result['duration_ms'] = _elapsed_ms(check_start)
+            return result
+
+        futures = {self._executor.submit(timed, name, check): name for name, check in checks.items()}
+        done, _ = wait(futures, timeout=budget)
+        for future, name in futures.items():
+            if future in done:
+                results[name] = future.result()
+            else:
+                future.cancel()
+                results[name] = {'status': 'timeout', 'duration_ms': _elapsed_ms(start)}
+        return self._result(tier, budget, start, results)
+
+    def _result(self, tier, budget, start, results):
+        duration_ms = _elapsed_ms(start)
+        budget_ms = round(budget * 1000, 3)
+        failed = any(result['status'] in ('fail', 'timeout') for result in results.values())
+        if failed or duration_ms > budget_ms:
+            status = 'DOWN'
+        elif any(result['status'] != 'ok' for result in results.values()):
+            status = 'DEGRADED'
+        else:
+            status = 'UP'
+        return {
+            'status': status,
+            'tier': tier,
+            'duration_ms': duration_ms,
+            'budget_ms': budget_ms,
+            'checks': results
+        }
+
+
+def _elapsed_ms(start):
+    return round((time.perf_counter() - start) * 1000, 3)
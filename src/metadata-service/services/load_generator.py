@@ -0,0 +1,207 @@
+import bisect
+import math
+import queue
+import random
+import threading
+import time
+from collections import Counter
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with ~1% relative precision
+
+    Buckets grow geometrically from 10us, so memory stays bounded no matter
+    how many values are recorded and percentiles are accurate to a bucket.
+    """
+
+    BASE_US = 10.0
+    GROWTH = 1.02
+
+    def __init__(self):
+        self.counts = Counter()
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._log_growth = math.log(self.GROWTH)
+
+    def record(self, latency_ms):
+        micros = max(latency_ms * 1000, self.BASE_US)
+        self.counts[int(math.log(micros / self.BASE_US) / self._log_growth)] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+        if latency_ms > self.max_ms:
+            self.max_ms = latency_ms
+
+    def _bucket_ms(self, index):
+        """Upper bound of a bucket in ms"""
+        return self.BASE_US * self.GROWTH ** (index + 1) / 1000
+
+    def percentile(self, pct):
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._bucket_ms(index), self.max_ms)
+        return self.max_ms
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total_ms / self.count, 2) if self.count else None,
+            'p50_ms': _round(self.percentile(50)),
+            'p90_ms': _round(self.percentile(90)),
+            'p99_ms': _round(self.percentile(99)),
+            'p999_ms': _round(self.percentile(99.9)),
+            'max_ms': _round(self.max_ms if self.count else None)
+        }
+
+
+def _round(value):
+    return None if value is None else round(value, 2)
+
+
+class HttpLoadGenerator:
+    """Open-loop, constant-arrival-rate HTTP load
+
+    A dispatcher schedules request i at start + i / rps regardless of how
+    earlier requests fared, and a pool of workers with keep-alive sessions
+    sends them. Latency is measured from the scheduled time, not the actual
+    send time, so queueing behind slow responses is counted instead of being
+    hidden (no coordinated omission).
+    """
+
+    def __init__(self, targets, rps, concurrency, timeout, max_backlog):
+        self.targets = targets
+        self.rps = rps
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_backlog = max_backlog
+
+        weights = [target['weight'] for target in targets]
+        self._cum_weights = [sum(weights[:i + 1]) for i in range(len(weights))]
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.histogram = LatencyHistogram()
+        self.per_target = {
+            target['url']: {'histogram': LatencyHistogram(), 'errors': 0, 'statuses': Counter()}
+            for target in targets
+        }
+        self.scheduled = 0
+        self.dropped = 0
+        self.errors = 0
+        self.started_at = None
+        self.ended_at = None
+
+    def _pick_target(self):
+        point = random.random() * self._cum_weights[-1]
+        return self.targets[bisect.bisect_right(self._cum_weights, point)]
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=len(self.targets), pool_maxsize=1)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._local.session = session
+        return session
+
+    def dispatch(self, duration, stop_event):
+        """Schedule requests at the configured rate until done or stopped"""
+        self.started_at = time.perf_counter()
+        end = self.started_at + duration
+        interval = 1.0 / self.rps
+        sent = 0
+
+        while not stop_event.is_set():
+            now = time.perf_counter()
+            if now >= end:
+                break
+            # Enqueue everything that is due, which keeps the rate exact at high RPS
+            due = min(int((now - self.started_at) / interval) + 1, int(duration * self.rps))
+            while sent < due:
+                intended = self.started_at + sent * interval
+                if self._queue.qsize() >= self.max_backlog:
+                    with self._lock:
+                        self.dropped += 1
+                else:
+                    self._queue.put(intended)
+                sent += 1
+            with self._lock:
+                self.scheduled = sent
+            next_due = self.started_at + sent * interval
+            stop_event.wait(max(0.0, min(next_due, end) - time.perf_counter()))
+
+        self.ended_at = time.perf_counter()
+        # Unblock the workers
+        for _ in range(self.concurrency):
+            self._queue.put(None)
+
+    def work(self, stop_event):
+        """Send scheduled requests until the dispatcher signals the end"""
+        while True:
+            intended = self._queue.get()
+            if intended is None or stop_event.is_set():
+                break
+            target = self._pick_target()
+            status = None
+            try:
+                response = self._session().request(target['method'], target['url'], timeout=self.timeout)
+                status = response.status_code
+                ok = status < 500
+            except requests.exceptions.RequestException:
+                ok = False
+            latency_ms = (time.perf_counter() - intended) * 1000
+
+            stats = self.per_target[target['url']]
+            with self._lock:
+                self.histogram.record(latency_ms)
+                stats['histogram'].record(latency_ms)
+                stats['statuses'][str(status) if status else 'error'] += 1
+                if not ok:
+                    self.errors += 1
+                    stats['errors'] += 1
+
+        session = getattr(self._local, 'session', None)
+        if session is not None:
+            session.close()
+
+    def stats(self):
+        """Achieved rate, error rate and latency histograms"""
+        with self._lock:
+            now = self.ended_at or time.perf_counter()
+            elapsed = now - self.started_at if self.started_at else 0
+            completed = self.histogram.count
+            return {
+                'target_rps': self.rps,
+                'achieved_rps': round(completed / elapsed, 2) if elapsed else 0,
+                'elapsed_seconds': round(elapsed, 1),
+                'scheduled': self.scheduled,
+                'completed': completed,
+                'backlog': self._queue.qsize(),
+                'dropped': self.dropped,
+                'errors': self.errors,
+                'error_rate': round(self.errors / completed, 4) if completed else 0,
+                'latency': self.histogram.summary(),
+                'targets': {
+                    url: {
+                        'weight': next(t['weight'] for t in self.targets if t['url'] == url),
+                        'errors': stats['errors'],
+                        'statuses': dict(stats['statuses']),
+                        'latency': stats['histogram'].summary()
+                    }
+                    for url, stats in self.per_target.items()
+                }
+            }
@@ -5,17 +5,104 @@ import socket
 import psutil
 import os
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from kubernetes import client, config
 from .environment_detector import EnvironmentDetector
+from .address_discovery import AddressDiscovery
+from .admission import parse_limits
 from utils.logger import setup_logger
+from config.settings import Config
 
 logger = setup_logger(__name__)
 
+SECTIONS = ('instance', 'deployment', 'network', 'system')
+
+# EC2 instance metadata paths, in response order
+IMDS_PATHS = {
+    'instance_id': 'instance-id',
+    'instance_type': 'instance-type',
+    'region': 'placement/region',
+    'availability_zone': 'placement/availability-zone',
+    'private_ip': 'local-ipv4'
+}
+
+# Fields that need describe_instances
+EC2_DETAIL_FIELDS = ('launch_time', 'subnet_id', 'vpc_id', 'security_groups', 'tags')
+
+# Fields that need read_node / read_namespaced_pod
+K8S_NODE_FIELDS = ('node_labels', 'node_annotations', 'node_capacity', 'node_allocatable',
+                   'node_conditions', 'region', 'availability_zone')
+K8S_POD_FIELDS = ('pod_ip', 'host_ip', 'pod_labels', 'pod_annotations')
+
+
+def _wants(fields, *names):
+    """Check whether any of names was requested (None means all fields)"""
+    return fields is None or any(name in fields for name in names)
+
+
+class UpstreamError(Exception):
+    """An upstream (IMDS, apiserver) failed; carries the degraded fallback payload"""
+
+    def __init__(self, message, fallback=None):
+        super().__init__(message)
+        self.fallback = fallback
+
+
+STALE_MARKERS = ('stale', 'snapshot_time')
+
+
+def _project(payload, fields):
+    """Keep only the requested top-level fields of a payload, plus any stale markers"""
+    return {name: value for name, value in payload.items() if name in fields or name in STALE_MARKERS}
+
+
+def _service_start_time():
+    """Start time shared by every worker: the gunicorn master's, else this process's
+
+    Each worker builds its own service, so a per-worker timestamp would give
+    every worker a different deployment payload and ETag.
+    """
+    process = psutil.Process()
+    try:
+        parent = psutil.Process(os.getppid())
+        if 'gunicorn' in ' '.join(parent.cmdline()):
+            process = parent
+    except psutil.Error:
+        pass
+    return datetime.utcfromtimestamp(process.create_time()).isoformat() + 'Z'
+
 class   MetadataService:
     def __init__(self):
         self.env_detector = EnvironmentDetector()
         self.environment = self.env_detector.detect_environment()
+        self.start_time = _service_start_time()
+        self.addresses = AddressDiscovery()
+        
+        # Cached payloads: key -> (expires_at, payload)
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=len(SECTIONS), thread_name_prefix='metadata')
+        
+        # Batched section requests get their own pool, sized for as many as
+        # admission control lets into this worker at once
+        batch_limit = parse_limits(Config.ADMISSION_ROUTE_LIMITS).get(
+            '/api/metadata', Config.ADMISSION_DEFAULT_ROUTE_LIMIT)
+        self._section_executor = ThreadPoolExecutor(max_workers=len(SECTIONS) * batch_limit,
+                                                    thread_name_prefix='metadata-section')
+        
+        # Background system sampler (HealthChecker) supplying CPU usage, if any
+        self.system_sampler = None
+        
+        # Last-known-good payloads: key -> {'payload', 'fetched_at'}, persisted to disk
+        self._snapshot = self._load_snapshot()
+        self._stale_views = {}
+        self._refreshing = set()
+        
+        # Outcome of the latest upstream fetch per key, read by readiness checks
+        self._upstream_status = {}
         
         # Initialize AWS clients
         try:
@@ -37,21 +124,179 @@ class   MetadataService:
                     self.k8s_client = client.CoreV1Api()
                 except:
                     logger.warning("Could not initialize Kubernetes client")
+        
+        # Replace any snapshot with fresh data in the background
+        self._refresh_async('instance', self._fetch_instance_metadata)
+        self._refresh_async('deployment', self._fetch_deployment_info)
+
+    def _cached(self, key, fetch, ttl=None):
+        """Return a cached payload, refreshing it in the background once the TTL expires
+
+        Only a key with nothing to serve is fetched in the request. Otherwise
+        the expired payload, or the last-known-good snapshot marked as stale,
+        is served while a single background refresh replaces it.
+        """
+        entry = self._cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        
+        if entry is not None or key in self._snapshot:
+            self._refresh_async(key, fetch)
+            return entry[1] if entry is not None else self._stale(key)
+        
+        try:
+            return self._fetch_and_store(key, fetch, ttl)
+        except UpstreamError as e:
+            self._record_upstream(key, e)
+            return self._store_fallback(key, e, ttl)
+
+    def _store_fallback(self, key, error, ttl=None):
+        """Cache the stale snapshot, or the error's fallback, after an upstream failure"""
+        if key in self._snapshot:
+            logger.warning("Serving stale %s metadata: %s", key, error)
+            # Hold on to it briefly before the upstream is retried
+            stale = self._stale(key)
+            self._store(key, stale, Config.METADATA_STALE_TTL)
+            return stale
+        if error.fallback is None:
+            raise error
+        self._store(key, error.fallback, ttl)
+        return error.fallback
+
+    def _fetch_and_store(self, key, fetch, ttl=None):
+        """Fetch a payload, cache it and remember it as last-known-good"""
+        payload = fetch()
+        self._record_upstream(key)
+        self._store(key, payload, ttl)
+        self._save_snapshot(key, payload)
+        return payload
+
+    def _store(self, key, payload, ttl=None):
+        ttl = Config.METADATA_CACHE_TTL if ttl is None else ttl
+        if ttl > 0:
+            with self._cache_lock:
+                self._cache[key] = (time.monotonic() + ttl, payload)
+
+    def _refresh_async(self, key, fetch):
+        """Refresh a payload in the background, at most once at a time"""
+        with self._cache_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        
+        def refresh():
+            try:
+                self._fetch_and_store(key, fetch)
+            except UpstreamError as e:
+                self._record_upstream(key, e)
+                logger.warning("Background %s refresh failed: %s", key, e)
+                try:
+                    self._store_fallback(key, e)
+                except UpstreamError:
+                    pass
+            except Exception as e:
+                self._record_upstream(key, e)
+                logger.error("Background %s refresh failed: %s", key, e)
+            finally:
+                with self._cache_lock:
+                    self._refreshing.discard(key)
+        
+        self._executor.submit(refresh)
+
+    def _record_upstream(self, key, error=None):
+        self._upstream_status[key] = {
+            'state': 'failing' if error else 'ok',
+            'checked_at': time.time(),
+            'error': str(error) if error else None
+        }
+
+    def upstream_status(self):
+        """Latest fetch outcome per cached key, without calling any upstream"""
+        now = time.monotonic()
+        statuses = {}
+        for key in ('instance', 'deployment'):
+            status = self._upstream_status.get(key)
+            entry = self._cache.get(key)
+            statuses[key] = {
+                'state': status['state'] if status else 'pending',
+                'age_seconds': round(time.time() - status['checked_at'], 1) if status else None,
+                'error': status['error'] if status else None,
+                'cached': bool(entry and entry[0] > now),
+                'has_snapshot': key in self._snapshot
+            }
+        return statuses
+
+    def _stale(self, key):
+        """Last-known-good payload marked as stale (one object per snapshot)"""
+        entry = self._snapshot[key]
+        view = self._stale_views.get(key)
+        if view is None or view[0] is not entry:
+            payload = {**entry['payload'], 'stale': True, 'snapshot_time': entry['fetched_at']}
+            view = (entry, payload)
+            self._stale_views[key] = view
+        return view[1]
+
+    def _load_snapshot(self):
+        """Load last-known-good payloads saved by a previous run"""
+        try:
+            with open(Config.METADATA_SNAPSHOT_PATH) as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable metadata snapshot: %s", e)
+            return {}
+        
+        if snapshot.get('environment') != self.environment:
+            return {}
+        logger.info("Loaded metadata snapshot from %s", Config.METADATA_SNAPSHOT_PATH)
+        return snapshot.get('entries', {})
+
+    def _save_snapshot(self, key, payload):
+        """Persist a fresh payload when it differs from the saved one"""
+        previous = self._snapshot.get(key)
+        if previous is not None and previous['payload'] == payload:
+            return
+        
+        with self._cache_lock:
+            self._snapshot = {
+                **self._snapshot,
+                key: {'payload': payload, 'fetched_at': datetime.utcnow().isoformat() + 'Z'}
+            }
+            snapshot = {'environment': self.environment, 'entries': self._snapshot}
+        
+        path = Config.METADATA_SNAPSHOT_PATH
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(snapshot, f, default=str)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not save metadata snapshot: %s", e)
 
     def get_instance_metadata(self):
         """Get instance metadata based on environment"""
         try:
-            if self.environment == 'aws':
-                return self._get_aws_instance_metadata()
-            elif self.environment == 'kubernetes':
-                return self._get_k8s_node_metadata()
-            else:
-                return self._get_local_metadata()
+            return self._cached('instance', self._fetch_instance_metadata)
         except Exception as e:
-            logger.error(f"Error getting instance metadata: {str(e)}")
+            logger.error("Error getting instance metadata: %s", e)
+            if 'instance' in self._snapshot:
+                return self._stale('instance')
             return self.get_dummy_metadata()
 
-    def _get_aws_instance_metadata(self):
+    def _fetch_instance_metadata(self, fields=None):
+        """Fetch instance metadata for the detected environment"""
+        if self.environment == 'aws':
+            return self._get_aws_instance_metadata(fields)
+        elif self.environment == 'kubernetes':
+            return self._get_k8s_node_metadata(fields)
+        else:
+            return self._get_local_metadata(fields)
+
+    def _get_aws_instance_metadata(self, fields=None):
         """Get AWS EC2 instance metadata"""
         try:
             # AWS Instance Metadata Service v2
@@ -68,53 +313,49 @@ class   MetadataService:
             
             headers = {"X-aws-ec2-metadata-token": token}
             
+            # describe_instances is only worth a round-trip for EC2 detail fields
+            need_details = self.ec2_client is not None and _wants(fields, *EC2_DETAIL_FIELDS)
+            
             # Get instance metadata
-            instance_id = requests.get(f"{metadata_url}/instance-id", headers=headers, timeout=2).text
-            instance_type = requests.get(f"{metadata_url}/instance-type", headers=headers, timeout=2).text
-            region = requests.get(f"{metadata_url}/placement/region", headers=headers, timeout=2).text
-            availability_zone = requests.get(f"{metadata_url}/placement/availability-zone", headers=headers, timeout=2).text
-            private_ip = requests.get(f"{metadata_url}/local-ipv4", headers=headers, timeout=2).text
+            metadata = {'environment': 'aws'}
+            for field, path in IMDS_PATHS.items():
+                if _wants(fields, field) or (field == 'instance_id' and need_details):
+                    metadata[field] = requests.get(f"{metadata_url}/{path}", headers=headers, timeout=2).text
             
-            try:
-                public_ip = requests.get(f"{metadata_url}/public-ipv4", headers=headers, timeout=2).text
-            except:
-                public_ip = None
+            if _wants(fields, 'public_ip'):
+                try:
+                    metadata['public_ip'] = requests.get(f"{metadata_url}/public-ipv4", headers=headers, timeout=2).text
+                except:
+                    metadata['public_ip'] = None
+            
+            metadata.update({
+                'hostname': socket.gethostname(),
+                'platform': 'EC2'
+            })
             
             # Get additional instance details
-            instance_details = {}
-            if self.ec2_client:
+            if need_details:
                 try:
-                    response = self.ec2_client.describe_instances(InstanceIds=[instance_id])
+                    response = self.ec2_client.describe_instances(InstanceIds=[metadata['instance_id']])
                     instance = response['Reservations'][0]['Instances'][0]
                     
-                    instance_details = {
+                    metadata.update({
                         'launch_time': instance.get('LaunchTime', '').isoformat() if instance.get('LaunchTime') else None,
                         'subnet_id': instance.get('SubnetId'),
                         'vpc_id': instance.get('VpcId'),
                         'security_groups': [sg['GroupName'] for sg in instance.get('SecurityGroups', [])],
                         'tags': {tag['Key']: tag['Value'] for tag in instance.get('Tags', [])}
-                    }
+                    })
                 except Exception as e:
-                    logger.warning(f"Could not get additional EC2 details: {str(e)}")
+                    logger.warning("Could not get additional EC2 details: %s", e)
             
-            return {
-                'environment': 'aws',
-                'instance_id': instance_id,
-                'instance_type': instance_type,
-                'region': region,
-                'availability_zone': availability_zone,
-                'private_ip': private_ip,
-                'public_ip': public_ip,
-                'hostname': socket.gethostname(),
-                'platform': 'EC2',
-                **instance_details
-            }
+            return metadata
             
-        except requests.exceptions.RequestException:
-            logger.info("Not running on AWS EC2, using local metadata")
-            return self._get_local_metadata()
+        except requests.exceptions.RequestException as e:
+            raise UpstreamError(f"EC2 instance metadata unavailable: {str(e)}",
+                                fallback=self._get_local_metadata(fields))
 
-    def _get_k8s_node_metadata(self):
+    def _get_k8s_node_metadata(self, fields=None):
         """Get Kubernetes node metadata"""
         try:
             node_name = os.environ.get('NODE_NAME') or socket.gethostname()
@@ -122,7 +363,8 @@ class   MetadataService:
             namespace = os.environ.get('POD_NAMESPACE', 'default')
             
             node_info = {}
-            if self.k8s_client:
+            upstream_error = None
+            if self.k8s_client and _wants(fields, *K8S_NODE_FIELDS):
                 try:
                     # Get node information
                     node = self.k8s_client.read_node(node_name)
@@ -139,27 +381,28 @@ class   MetadataService:
                             } for condition in (node.status.conditions or [])
                         ]
                     }
-                    
-                    # Try to get pod information
-                    try:
-                        pod = self.k8s_client.read_namespaced_pod(pod_name, namespace)
-                        node_info.update({
-                            'pod_ip': pod.status.pod_ip,
-                            'host_ip': pod.status.host_ip,
-                            'pod_labels': pod.metadata.labels,
-                            'pod_annotations': pod.metadata.annotations
-                        })
-                    except:
-                        pass
-                        
                 except Exception as e:
-                    logger.warning(f"Could not get K8s node details: {str(e)}")
+                    logger.warning("Could not get K8s node details: %s", e)
+                    upstream_error = e
+            
+            if self.k8s_client and _wants(fields, *K8S_POD_FIELDS):
+                # Try to get pod information
+                try:
+                    pod = self.k8s_client.read_namespaced_pod(pod_name, namespace)
+                    node_info.update({
+                        'pod_ip': pod.status.pod_ip,
+                        'host_ip': pod.status.host_ip,
+                        'pod_labels': pod.metadata.labels,
+                        'pod_annotations': pod.metadata.annotations
+                    })
+                except:
+                    pass
             
             # Get region from node labels or environment
             region = 'unknown'
             zone = 'unknown'
             
-            if 'node_labels' in node_info:
+            if node_info.get('node_labels'):
                 region = (node_info['node_labels'].get('topology.kubernetes.io/region') or 
                          node_info['node_labels'].get('failure-domain.beta.kubernetes.io/region') or 
                          'unknown')
@@ -167,7 +410,7 @@ class   MetadataService:
                        node_info['node_labels'].get('failure-domain.beta.kubernetes.io/zone') or 
                        'unknown')
             
-            return {
+            metadata = {
                 'environment': 'kubernetes',
                 'node_name': node_name,
                 'pod_name': pod_name,
@@ -176,160 +419,216 @@ class   MetadataService:
                 'availability_zone': zone,
                 'hostname': socket.gethostname(),
                 'platform': 'Kubernetes',
-                'private_ip': self._get_private_ip(),
+                'private_ip': self._get_private_ip() if _wants(fields, 'private_ip') else None,
                 **node_info
             }
             
+            if upstream_error is not None:
+                raise UpstreamError(f"Kubernetes API unavailable: {str(upstream_error)}", fallback=metadata)
+            return metadata
+            
+        except UpstreamError:
+            raise
         except Exception as e:
-            logger.error(f"Error getting K8s metadata: {str(e)}")
-            return self._get_local_metadata()
+            logger.error("Error getting K8s metadata: %s", e)
+            return self._get_local_metadata(fields)
 
-    def _get_local_metadata(self):
+    def _get_local_metadata(self, fields=None):
         """Get real local development metadata"""
-        return {
-            'environment': 'local',
-            'hostname': socket.gethostname(),
-            'private_ip': self._get_private_ip(),
-            'platform': platform.system(),
-            'platform_release': platform.release(),
-            'platform_version': platform.version(),
-            'architecture': platform.machine(),
-            'cpu_count': psutil.cpu_count(logical=True),
-            'memory_total_gb': round(psutil.virtual_memory().total / (1024**3), 2),
-            'disk_total_gb': round(psutil.disk_usage('/').total / (1024**3), 2),
-            'region': os.environ.get('LOCAL_REGION', 'local'),
-            'availability_zone': os.environ.get('LOCAL_AZ', socket.gethostname()),
-            'instance_id': f"local-{socket.gethostname()}",
-            'note': 'Running in local development mode'
+        collectors = {
+            'environment': lambda: 'local',
+            'hostname': socket.gethostname,
+            'private_ip': self._get_private_ip,
+            'platform': platform.system,
+            'platform_release': platform.release,
+            'platform_version': platform.version,
+            'architecture': platform.machine,
+            'cpu_count': lambda: psutil.cpu_count(logical=True),
+            'memory_total_gb': lambda: round(psutil.virtual_memory().total / (1024**3), 2),
+            'disk_total_gb': lambda: round(psutil.disk_usage('/').total / (1024**3), 2),
+            'region': lambda: os.environ.get('LOCAL_REGION', 'local'),
+            'availability_zone': lambda: os.environ.get('LOCAL_AZ', socket.gethostname()),
+            'instance_id': lambda: f"local-{socket.gethostname()}",
+            'note': lambda: 'Running in local development mode'
         }
+        return {name: collect() for name, collect in collectors.items() if _wants(fields, name)}
 
     def get_deployment_info(self):
         """Get deployment information"""
         try:
-            deployment_info = {
-                'service_name': 'metadata-service',
-                'version': '1.0.0',
-                'environment': self.environment,
-                'start_time': datetime.utcnow().isoformat() + 'Z',
-                'uptime_seconds': int(psutil.boot_time()),
-                'platform_info': self._get_platform_info()
-            }
-            
-            if self.environment == 'aws':
-                deployment_info.update({
-                    'cloud_provider': 'AWS',
-                    'deployment_type': 'EC2'
-                })
-            elif self.environment == 'kubernetes':
-                deployment_info.update({
-                    'deployment_type': 'Kubernetes',
-                    'container_runtime': 'docker'
-                })
-            else:
-                deployment_info.update({
-                    'deployment_type': 'Local'
-                })
-                
-            return deployment_info
-            
+            return self._cached('deployment', self._fetch_deployment_info)
         except Exception as e:
-            logger.error(f"Error getting deployment info: {str(e)}")
+            logger.error("Error getting deployment info: %s", e)
+            if 'deployment' in self._snapshot:
+                return self._stale('deployment')
             return self.get_dummy_deployment_info()
 
-    def get_network_info(self):
+    def _fetch_deployment_info(self):
+        """Build deployment information"""
+        deployment_info = {
+            'service_name': 'metadata-service',
+            'version': '1.0.0',
+            'environment': self.environment,
+            'start_time': self.start_time,
+            'uptime_seconds': int(psutil.boot_time()),
+            'platform_info': self._get_platform_info()
+        }
+        
+        if self.environment == 'aws':
+            deployment_info.update({
+                'cloud_provider': 'AWS',
+                'deployment_type': 'EC2'
+            })
+        elif self.environment == 'kubernetes':
+            deployment_info.update({
+                'deployment_type': 'Kubernetes',
+                'container_runtime': 'docker'
+            })
+        else:
+            deployment_info.update({
+                'deployment_type': 'Local'
+            })
+            
+        return deployment_info
+
+    def get_network_info(self, fields=None):
         """Get network information"""
         try:
-            network_interfaces = []
-            
-            for interface, addresses in psutil.net_if_addrs().items():
-                interface_info = {
-                    'name': interface,
-                    'addresses': []
-                }
-                
-                for addr in addresses:
-                    if addr.family == socket.AF_INET:  # IPv4
-                        interface_info['addresses'].append({
-                            'type': 'IPv4',
-                            'address': addr.address,
-                            'netmask': addr.netmask
-                        })
-                    elif addr.family == socket.AF_INET6:  # IPv6
-                        interface_info['addresses'].append({
-                            'type': 'IPv6',
-                            'address': addr.address,
-                            'netmask': addr.netmask
-                        })
-                
-                if interface_info['addresses']:
-                    network_interfaces.append(interface_info)
-            
-            # Get network statistics
-            net_io = psutil.net_io_counters()
-            
-            return {
-                'interfaces': network_interfaces,
-                'primary_ip': self._get_private_ip(),
-                'hostname': socket.gethostname(),
-                'network_stats': {
-                    'bytes_sent': net_io.bytes_sent,
-                    'bytes_recv': net_io.bytes_recv,
-                    'packets_sent': net_io.packets_sent,
-                    'packets_recv': net_io.packets_recv
-                }
+            collectors = {
+                'interfaces': self._get_network_interfaces,
+                'primary_ip': self._get_private_ip,
+                'hostname': socket.gethostname,
+                'network_stats': self._get_network_stats
             }
+            return {name: collect() for name, collect in collectors.items() if _wants(fields, name)}
             
         except Exception as e:
-            logger.error(f"Error getting network info: {str(e)}")
+            logger.error("Error getting network info: %s", e)
             raise
 
-    def get_system_info(self):
-        """Get system information"""
+    def _get_network_interfaces(self):
+        """Get network interfaces with their IPv4/IPv6 addresses"""
+        return self.addresses.get_interfaces()
+
+    def _get_network_stats(self):
+        """Get network I/O statistics"""
+        net_io = psutil.net_io_counters()
+        return {
+            'bytes_sent': net_io.bytes_sent,
+            'bytes_recv': net_io.bytes_recv,
+            'packets_sent': net_io.packets_sent,
+            'packets_recv': net_io.packets_recv
+        }
+
+    def get_system_info(self, fields=None, live=False):
+        """Get system information; live measures CPU usage instead of using the background sample"""
         try:
-            cpu_info = {
-                'count': psutil.cpu_count(),
-                'usage_percent': psutil.cpu_percent(interval=1)
-            }
-            
-            memory = psutil.virtual_memory()
-            memory_info = {
-                'total_gb': round(memory.total / (1024**3), 2),
-                'available_gb': round(memory.available / (1024**3), 2),
-                'used_percent': memory.percent
-            }
-            
-            disk = psutil.disk_usage('/')
-            disk_info = {
-                'total_gb': round(disk.total / (1024**3), 2),
-                'used_gb': round(disk.used / (1024**3), 2),
-                'free_gb': round(disk.free / (1024**3), 2),
-                'used_percent': round((disk.used / disk.total) * 100, 1)
-            }
-            
-            return {
-                'cpu': cpu_info,
-                'memory': memory_info,
-                'disk': disk_info,
-                'load_average': os.getloadavg() if hasattr(os, 'getloadavg') else None
+            collectors = {
+                'cpu': lambda: self._get_cpu_info(live),
+                'memory': self._get_memory_info,
+                'disk': self._get_disk_info,
+                'load_average': lambda: os.getloadavg() if hasattr(os, 'getloadavg') else None
             }
+            return {name: collect() for name, collect in collectors.items() if _wants(fields, name)}
             
         except Exception as e:
-            logger.error(f"Error getting system info: {str(e)}")
+            logger.error("Error getting system info: %s", e)
             return {
                 'cpu': {'count': 1, 'usage_percent': 0},
                 'memory': {'total_gb': 1, 'available_gb': 1, 'used_percent': 0},
                 'disk': {'total_gb': 10, 'used_gb': 1, 'free_gb': 9, 'used_percent': 10}
             }
 
+    def _get_cpu_info(self, live=False):
+        """Get CPU count and usage, from the background sample unless live
+
+        A live reading samples usage over one second.
+        """
+        system = self.system_sampler.system if self.system_sampler is not None else None
+        if system is not None and not live:
+            return system['cpu']
+        return {
+            'count': psutil.cpu_count(),
+            'usage_percent': psutil.cpu_percent(interval=1 if live else None)
+        }
+
+    def _get_memory_info(self):
+        """Get virtual memory usage"""
+        memory = psutil.virtual_memory()
+        return {
+            'total_gb': round(memory.total / (1024**3), 2),
+            'available_gb': round(memory.available / (1024**3), 2),
+            'used_percent': memory.percent
+        }
+
+    def _get_disk_info(self):
+        """Get root filesystem usage"""
+        disk = psutil.disk_usage('/')
+        return {
+            'total_gb': round(disk.total / (1024**3), 2),
+            'used_gb': round(disk.used / (1024**3), 2),
+            'free_gb': round(disk.free / (1024**3), 2),
+            'used_percent': round((disk.used / disk.total) * 100, 1)
+        }
+
+    def get_sections(self, sections, fields=None):
+        """Gather several metadata sections concurrently in one call
+
+        fields maps a section name to the set of top-level fields wanted from
+        it, or None for all of them. Returns (data, errors) keyed by section.
+        """
+        fields = fields or {}
+        fetchers = {
+            'instance': self._get_instance_section,
+            'deployment': self._get_deployment_section,
+            'network': self.get_network_info,
+            'system': self.get_system_info
+        }
+        
+        data, errors = {}, {}
+        if len(sections) == 1:
+            futures = None
+        else:
+            futures = {
+                section: self._section_executor.submit(fetchers[section], fields.get(section))
+                for section in sections
+            }
+        
+        for section in sections:
+            try:
+                if futures is None:
+                    data[section] = fetchers[section](fields.get(section))
+                else:
+                    data[section] = futures[section].result()
+            except Exception as e:
+                logger.error("Error getting %s section: %s", section, e)
+                errors[section] = str(e)
+        
+        return data, errors
+
+    def _get_instance_section(self, fields=None):
+        """Instance metadata, projected from the cache or snapshot when there is one"""
+        if fields is None:
+            return self.get_instance_metadata()
+        
+        if 'instance' in self._cache or 'instance' in self._snapshot:
+            return _project(self._cached('instance', self._fetch_instance_metadata), fields)
+        try:
+            return _project(self._fetch_instance_metadata(fields), fields)
+        except UpstreamError as e:
+            self._record_upstream('instance', e)
+            if 'instance' in self._snapshot:
+                return _project(self._stale('instance'), fields)
+            return _project(e.fallback, fields)
+
+    def _get_deployment_section(self, fields=None):
+        """Deployment information, optionally projected to fields"""
+        deployment_info = self.get_deployment_info()
+        return deployment_info if fields is None else _project(deployment_info, fields)
+
     def _get_private_ip(self):
         """Get primary private IP address"""
-        try:
-            # Connect to a remote address to determine the local IP
-            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-                s.connect(("8.8.8.8", 80))
-                return s.getsockname()[0]
-        except:
-            return '127.0.0.1'
+        return self.addresses.get_primary_ip()
 
     def _get_aws_region(self):
         """Get AWS region from environment or metadata"""
@@ -383,7 +682,7 @@ class   MetadataService:
             'environment': 'demo',
             'cloud_provider': 'AWS',
             'deployment_type': 'EC2',
-            'start_time': datetime.utcnow().isoformat() + 'Z',
+            'start_time': self.start_time,
             'platform_info': {
                 'system': 'Linux',
                 'release': '5.4.0',
@@ -0,0 +1,165 @@
+import cProfile
+import io
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# From 3.12 cProfile is built on sys.monitoring and records every thread
+PROFILES_ALL_THREADS = sys.version_info >= (3, 12)
+CONCURRENT_ROUTE = '<concurrent>'
+
+
+class ProfilerBusyError(Exception):
+    """Raised when a sampling session is already running in this worker"""
+
+
+class StackSampler:
+    """Low-overhead wall-clock sampler over every thread of this process
+
+    Stacks are read with sys._current_frames() from a separate thread, so the
+    sampled code runs unmodified; the cost is one frame walk per thread per
+    interval.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def sample(self, seconds, interval):
+        """Sample all threads for `seconds`, returning a Counter of stacks"""
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError('A sampling session is already running in this worker')
+
+        try:
+            logger.info("Sampling stacks for %ss every %ss", seconds, interval)
+            stacks = Counter()
+            own_ident = threading.get_ident()
+            deadline = time.monotonic() + seconds
+            samples = 0
+
+            while time.monotonic() < deadline:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for ident, frame in sys._current_frames().items():
+                    if ident == own_ident:
+                        continue
+                    stacks[self._collapse(names.get(ident, str(ident)), frame)] += 1
+                samples += 1
+                time.sleep(interval)
+
+            return stacks, samples
+        finally:
+            self._lock.release()
+
+    def _collapse(self, thread_name, frame):
+        """Render a frame chain as 'thread;root;...;leaf'"""
+        parts = []
+        while frame is not None:
+            code = frame.f_code
+            parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        parts.append(thread_name)
+        return ';'.join(reversed(parts))
+
+    @staticmethod
+    def format_collapsed(stacks):
+        """Brendan Gregg's collapsed format, as read by flamegraph.pl and speedscope"""
+        return ''.join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class RequestProfiler:
+    """cProfile a random fraction of requests and aggregate stats per route
+
+    Only one request is profiled at a time per worker, since the interpreter
+    allows a single active profiler; requests arriving meanwhile are skipped.
+    Where cProfile records every thread, a profile that overlapped other
+    requests or busy background work (busy() returning True) cannot be
+    attributed to its route and is filed under CONCURRENT_ROUTE instead.
+    """
+
+    def __init__(self, rate=0.0, busy=None):
+        self.rate = rate
+        self.busy = busy
+        self._active = threading.Lock()
+        self._stats = {}
+        self._counts = Counter()
+        self._stats_lock = threading.Lock()
+        self._in_flight = 0
+        self._overlapped = False
+        self._flight_lock = threading.Lock()
+
+    def start(self):
+        """Track a request and maybe profile it; returns a profile or None
+
+        Every start() must be paired with a stop(), even when it returns None.
+        """
+        with self._flight_lock:
+            self._in_flight += 1
+            if self._in_flight > 1:
+                self._overlapped = True
+
+        if self.rate <= 0 or random.random() >= self.rate:
+            return None
+        if not self._active.acquire(blocking=False):
+            return None
+
+        profile = cProfile.Profile()
+        with self._flight_lock:
+            self._overlapped = self._in_flight > 1
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiling tool is active in this interpreter
+            self._active.release()
+            return None
+        return profile
+
+    def stop(self, profile, route):
+        """End a request; a profile is folded into its route's stats"""
+        with self._flight_lock:
+            self._in_flight -= 1
+        if profile is None:
+            return
+
+        try:
+            profile.disable()
+            shared = PROFILES_ALL_THREADS and (self._overlapped or (self.busy is not None and self.busy()))
+        finally:
+            self._active.release()
+
+        if shared:
+            route = CONCURRENT_ROUTE
+        with self._stats_lock:
+            if route in self._stats:
+                self._stats[route].add(profile)
+            else:
+                self._stats[route] = pstats.Stats(profile)
+            self._counts[route] += 1
+
+    def routes(self):
+        """Number of profiled requests per route"""
+        with self._stats_lock:
+            return dict(self._counts)
+
+    def report(self, route, sort='cumulative', limit=30):
+        """Text report of the top functions for a route, or None"""
+        with self._stats_lock:
+            stats = self._stats.get(route)
+            if stats is None:
+                return None
+            out = io.StringIO()
+            stats.stream = out
+            stats.sort_stats(sort).print_stats(limit)
+            return out.getvalue()
+
+    def reset(self):
+        """Drop collected stats"""
+        with self._stats_lock:
+            self._stats.clear()
+            self._counts.clear()
@@ -0,0 +1,172 @@
+import gc
+import json
+import os
+import threading
+import time
+
+import psutil
+
+from config.settings import Config
+from utils.logger import setup_logger, get_log_stats
+
+logger = setup_logger(__name__)
+
+
+class RuntimeStats:
+    """Per-worker runtime introspection, aggregated across the pod
+
+    Every gunicorn worker times its own GC pauses through gc.callbacks and
+    periodically publishes a snapshot to RUNTIME_STATS_DIR as <pid>.json.
+    Any worker can then answer for the whole pod by reading those files.
+    """
+
+    def __init__(self, stress_service=None):
+        self.stress_service = stress_service
+        self._gc_started = None
+        self._publisher_pid = None
+        self._publisher_lock = threading.Lock()
+        self._reset()
+        gc.callbacks.append(self._on_gc)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        """Start counters afresh, e.g. in a freshly forked worker"""
+        self.started_at = time.time()
+        self.gc_pauses = {
+            generation: {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'collected': 0}
+            for generation in range(3)
+        }
+
+    def _on_gc(self, phase, info):
+        if phase == 'start':
+            self._gc_started = time.perf_counter()
+        elif self._gc_started is not None:
+            pause_ms = (time.perf_counter() - self._gc_started) * 1000
+            self._gc_started = None
+            stats = self.gc_pauses[info['generation']]
+            stats['count'] += 1
+            stats['total_ms'] += pause_ms
+            stats['collected'] += info.get('collected', 0)
+            if pause_ms > stats['max_ms']:
+                stats['max_ms'] = pause_ms
+
+    def snapshot(self):
+        """Runtime stats for this worker"""
+        process = psutil.Process()
+        with process.oneshot():
+            memory = process.memory_info()
+            snapshot = {
+                'pid': process.pid,
+                'uptime_seconds': round(time.time() - self.started_at, 1),
+                'rss_mb': round(memory.rss / (1024**2), 2),
+                'vms_mb': round(memory.vms / (1024**2), 2),
+                'cpu_times': process.cpu_times()._asdict(),
+                'threads': {
+                    'os': process.num_threads(),
+                    'python': threading.active_count(),
+                    'names': sorted(thread.name for thread in threading.enumerate())
+                },
+                'fds': process.num_fds() if hasattr(process, 'num_fds') else None
+            }
+
+        snapshot['gc'] = {
+            'enabled': gc.isenabled(),
+            'counts': gc.get_count(),
+            'thresholds': gc.get_threshold(),
+            'tracked_objects': len(gc.get_objects()) if Config.RUNTIME_STATS_COUNT_OBJECTS else None,
+            'pauses': {
+                str(generation): {**stats, 'total_ms': round(stats['total_ms'], 3),
+                                  'max_ms': round(stats['max_ms'], 3)}
+                for generation, stats in self.gc_pauses.items()
+            }
+        }
+        snapshot['logging'] = get_log_stats()
+        if self.stress_service is not None:
+            snapshot['stress_workers'] = self.stress_service.get_workers()
+        snapshot['published_at'] = time.time()
+        return snapshot
+
+    def ensure_publisher(self):
+        """Start the background publisher in this process if needed"""
+        if self._publisher_pid == os.getpid():
+            return
+        with self._publisher_lock:
+            if self._publisher_pid == os.getpid():
+                return
+            self._publisher_pid = os.getpid()
+            thread = threading.Thread(target=self._publish_loop, name='runtime-stats-publisher')
+            thread.daemon = True
+            thread.start()
+
+    def _publish_loop(self):
+        while True:
+            try:
+                self.publish()
+            except Exception as e:
+                logger.warning("Could not publish runtime stats: %s", e)
+            time.sleep(Config.RUNTIME_STATS_INTERVAL)
+
+    def publish(self, snapshot=None):
+        """Write this worker's snapshot for the other workers to read"""
+        snapshot = snapshot or self.snapshot()
+        os.makedirs(Config.RUNTIME_STATS_DIR, exist_ok=True)
+        path = os.path.join(Config.RUNTIME_STATS_DIR, f"{snapshot['pid']}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshot, f, default=str)
+        os.replace(tmp_path, path)
+        return snapshot
+
+    def aggregate(self):
+        """Snapshots of every live worker in the pod plus totals"""
+        # Publish our own state first so this worker is never stale
+        own = self.publish()
+        workers = {own['pid']: own}
+        stale_after = Config.RUNTIME_STATS_INTERVAL * 3
+
+        try:
+            names = os.listdir(Config.RUNTIME_STATS_DIR)
+        except OSError:
+            names = []
+
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(Config.RUNTIME_STATS_DIR, name)
+            pid = int(name[:-5]) if name[:-5].isdigit() else None
+            if pid is None or pid in workers:
+                continue
+            if not psutil.pid_exists(pid):
+                self._remove(path)
+                continue
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            snapshot['stale'] = time.time() - snapshot.get('published_at', 0) > stale_after
+            workers[pid] = snapshot
+
+        snapshots = list(workers.values())
+        return {
+            'workers': snapshots,
+            'totals': {
+                'workers': len(snapshots),
+                'rss_mb': round(sum(s['rss_mb'] for s in snapshots), 2),
+                'threads': sum(s['threads']['os'] for s in snapshots),
+                'fds': sum(s['fds'] or 0 for s in snapshots),
+                'gc_pause_ms': round(sum(p['total_ms'] for s in snapshots
+                                         for p in s['gc']['pauses'].values()), 3),
+                'gc_max_pause_ms': max((p['max_ms'] for s in snapshots
+                                        for p in s['gc']['pauses'].values()), default=0),
+                'stress_workers': sum(len(s.get('stress_workers', [])) for s in snapshots),
+                'log_records_dropped': sum(s['logging']['dropped'] for s in snapshots)
+            }
+        }
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
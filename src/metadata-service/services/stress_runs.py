@@ -0,0 +1,238 @@
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import psutil
+import requests
+
+from config.settings import Config
+from utils.logger import setup_logger
+
+try:
+    import fcntl
+except ImportError:  # No cross-process locking on this platform
+    fcntl = None
+
+logger = setup_logger(__name__)
+
+PROBE_PATHS = ('/api/metadata/instance', '/api/metadata/deployment', '/api/metadata/network')
+
+
+def _percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize_latencies(latencies, errors=0):
+    """Count, error count and p50/p95/max of a list of latencies in ms"""
+    return {
+        'count': len(latencies),
+        'errors': errors,
+        'p50_ms': _round(_percentile(latencies, 50)),
+        'p95_ms': _round(_percentile(latencies, 95)),
+        'max_ms': _round(max(latencies) if latencies else None)
+    }
+
+
+def _round(value, digits=2):
+    return None if value is None else round(value, digits)
+
+
+class StressRunStore:
+    """Append-only JSON Lines store of finished stress runs
+
+    One compact line is appended per run, guarded by an advisory file lock so
+    several gunicorn workers can share the file. Reads never rewrite it.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or Config.STRESS_RUNS_PATH
+
+    def append(self, record):
+        """Append one run record"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        line = json.dumps(record, separators=(',', ':'), default=str) + '\n'
+        with open(self.path, 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.write(line)
+                f.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _lines(self):
+        try:
+            with open(self.path) as f:
+                return f.readlines()
+        except FileNotFoundError:
+            return []
+
+    def list(self, limit=20):
+        """Summaries of the most recent runs, newest first"""
+        runs = []
+        for line in reversed(self._lines()):
+            if len(runs) >= limit:
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            record.pop('samples', None)
+            runs.append(record)
+        return runs
+
+    def get(self, run_id):
+        """Full record of a run, or None"""
+        marker = f'"id":"{run_id}"'
+        for line in reversed(self._lines()):
+            if marker in line:
+                try:
+                    return json.loads(line)
+                except ValueError:
+                    return None
+        return None
+
+
+class StressRun:
+    """Records one stress run: parameters, system samples and self-probe latency
+
+    The service probes its own metadata endpoints before the run to get a
+    baseline, once per sample while the run is going, and again afterwards.
+    """
+
+    def __init__(self, stress_type, duration, store, params=None):
+        self.id = f"{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.stress_type = stress_type
+        self.duration = duration
+        self.params = params or {}
+        self.store = store
+        self.status = 'running'
+        self.started_at = None
+        self.probes = {}
+        self.results = None
+        self.samples = {'t': [], 'cpu': [], 'proc_cpu': [], 'mem': [], 'load1': [], 'rss_mb': [],
+                        'probe_ms': []}
+        self._during = []
+        self._during_errors = 0
+        self._stop = threading.Event()
+        self._sampler = None
+        self._process = psutil.Process()
+        self._session = requests.Session()
+
+    def probe(self):
+        """Time one request to each probe path; returns (latencies, errors)"""
+        latencies, errors = [], 0
+        for path in PROBE_PATHS:
+            start = time.perf_counter()
+            try:
+                response = self._session.get(f"{Config.SELF_PROBE_BASE_URL}{path}",
+                                             timeout=Config.SELF_PROBE_TIMEOUT)
+                elapsed = (time.perf_counter() - start) * 1000
+                if response.status_code >= 500:
+                    errors += 1
+                else:
+                    latencies.append(elapsed)
+            except requests.exceptions.RequestException:
+                errors += 1
+        return latencies, errors
+
+    def probe_phase(self, phase):
+        """Run SELF_PROBE_ROUNDS probe rounds and store their summary"""
+        latencies, errors = [], 0
+        for _ in range(Config.SELF_PROBE_ROUNDS):
+            round_latencies, round_errors = self.probe()
+            latencies.extend(round_latencies)
+            errors += round_errors
+        self.probes[phase] = summarize_latencies(latencies, errors)
+
+    def start(self):
+        """Start sampling in the background"""
+        self.started_at = time.time()
+        psutil.cpu_percent(interval=None)
+        self._process.cpu_percent(interval=None)
+        self._sampler = threading.Thread(target=self._sample_loop, name=f"stress-run-{self.id}")
+        self._sampler.daemon = True
+        self._sampler.start()
+
+    def _sample_loop(self):
+        while not self._stop.wait(Config.STRESS_SAMPLE_INTERVAL):
+            try:
+                self._sample()
+            except Exception as e:
+                logger.warning("Stress run sample failed: %s", e)
+
+    def _sample(self):
+        latencies, errors = self.probe()
+        self._during.extend(latencies)
+        self._during_errors += errors
+
+        samples = self.samples
+        samples['t'].append(round(time.time() - self.started_at, 1))
+        samples['cpu'].append(psutil.cpu_percent(interval=None))
+        samples['proc_cpu'].append(round(self._process.cpu_percent(interval=None), 1))
+        samples['mem'].append(psutil.virtual_memory().percent)
+        samples['load1'].append(_round(os.getloadavg()[0]) if hasattr(os, 'getloadavg') else None)
+        samples['rss_mb'].append(round(self._process.memory_info().rss / (1024**2), 1))
+        samples['probe_ms'].append(_round(max(latencies)) if latencies else None)
+
+    def stop(self, status='completed'):
+        """Stop sampling; the status is kept unless already set by mark()"""
+        self._stop.set()
+        if self._sampler is not None and self._sampler is not threading.current_thread():
+            self._sampler.join(timeout=Config.STRESS_SAMPLE_INTERVAL + Config.SELF_PROBE_TIMEOUT)
+        if self.status == 'running':
+            self.status = status
+        self.probes['during'] = summarize_latencies(self._during, self._during_errors)
+
+    def mark(self, status):
+        """Record how the run ended, e.g. 'stopped' by a user"""
+        self.status = status
+
+    def finish(self):
+        """Persist the run record"""
+        record = self.to_dict()
+        try:
+            self.store.append(record)
+        except OSError as e:
+            logger.error("Could not persist stress run %s: %s", self.id, e)
+        finally:
+            self._session.close()
+        return record
+
+    def to_dict(self):
+        """Compact record: parameters, probe summaries and columnar samples"""
+        baseline = self.probes.get('before', {})
+        during = self.probes.get('during', {})
+
+        degradation = {}
+        for stat in ('p50_ms', 'p95_ms'):
+            if baseline.get(stat) and during.get(stat) is not None:
+                degradation[stat.replace('_ms', '_ratio')] = round(during[stat] / baseline[stat], 2)
+
+        ended_at = time.time()
+        return {
+            'id': self.id,
+            'type': self.stress_type,
+            'duration': self.duration,
+            'params': self.params,
+            'status': self.status,
+            'pid': os.getpid(),
+            'started_at': datetime.utcfromtimestamp(self.started_at or ended_at).isoformat() + 'Z',
+            'ended_at': datetime.utcfromtimestamp(ended_at).isoformat() + 'Z',
+            'elapsed_seconds': round(ended_at - (self.started_at or ended_at), 1),
+            'probes': self.probes,
+            'degradation': degradation,
+            'results': self.results,
+            'samples': {'interval': Config.STRESS_SAMPLE_INTERVAL, **self.samples}
+        }
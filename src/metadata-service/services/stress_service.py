@@ -3,19 +3,151 @@ import threading
 import time
 import multiprocessing
 import os
+from urllib.parse import urlparse
+from .load_generator import HttpLoadGenerator
 from utils.logger import setup_logger
+from config.settings import Config
 
 logger = setup_logger(__name__)
 
+STRESS_TYPES = ('cpu', 'memory', 'mixed', 'http')
+
+
+def parse_targets(spec):
+    """Parse 'url|weight,url' into target dicts"""
+    targets = []
+    for item in spec.split(','):
+        url, _, weight = item.strip().partition('|')
+        if url:
+            targets.append({'url': url, 'weight': float(weight or 1)})
+    return targets
+
+
+def positive_number(value, name):
+    """Return value if it is a positive number, else raise ValueError"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not value > 0:
+        raise ValueError(f"{name} must be a positive number")
+    return value
+
+
 class StressService:
     def __init__(self):
-        self.stress_threads = []
+        # Live stress threads: name -> {'thread', 'type', 'started_at'}
+        self.stress_workers = {}
+        self._workers_lock = threading.Lock()
+        self._worker_seq = 0
+        self._stop_event = threading.Event()
         self.stress_active = False
+        self.http_load = None
+    
+    def spawn_worker(self, kind, target, *args):
+        """Start a daemon thread that stays registered until it exits"""
+        with self._workers_lock:
+            self._worker_seq += 1
+            name = f"stress-{kind}-{self._worker_seq}"
+        
+        def run():
+            try:
+                target(*args)
+            finally:
+                with self._workers_lock:
+                    self.stress_workers.pop(name, None)
         
-    def start_stress(self, stress_type, duration):
-        """Start stress test"""
+        thread = threading.Thread(target=run, name=name)
+        thread.daemon = True
+        with self._workers_lock:
+            self.stress_workers[name] = {
+                'thread': thread,
+                'type': kind,
+                'started_at': time.time()
+            }
+        thread.start()
+        return thread
+    
+    def get_workers(self):
+        """Live registry of stress threads"""
+        now = time.time()
+        with self._workers_lock:
+            return [
+                {
+                    'name': name,
+                    'type': info['type'],
+                    'alive': info['thread'].is_alive(),
+                    'age_seconds': round(now - info['started_at'], 1)
+                }
+                for name, info in self.stress_workers.items()
+            ]
+        
+    def validate_options(self, stress_type, data):
+        """Check a stress request, returning the options for start_stress
+        
+        HTTP targets can only be picked from HTTP_STRESS_TARGETS, by URL,
+        host name or index, so the endpoint cannot send load to arbitrary hosts.
+        """
+        if stress_type not in STRESS_TYPES:
+            raise ValueError(f"Unknown stress type: {stress_type}")
+        positive_number(data.get('duration', 300), 'duration')
+        if stress_type != 'http':
+            return {}
+        
+        allowed = parse_targets(Config.HTTP_STRESS_TARGETS)
+        requested = data.get('targets') or list(range(len(allowed)))
+        if not isinstance(requested, list):
+            raise ValueError("targets must be a list")
+        
+        normalized = []
+        for target in requested:
+            if isinstance(target, dict):
+                configured = self._find_target(allowed, target.get('target', target.get('url')))
+                weight = positive_number(target.get('weight', configured['weight']), 'weight')
+            else:
+                configured = self._find_target(allowed, target)
+                weight = configured['weight']
+            normalized.append({'url': configured['url'], 'weight': weight, 'method': 'GET'})
+        if not normalized:
+            raise ValueError("At least one target is required")
+        
+        rps = positive_number(data.get('rps', Config.HTTP_STRESS_RPS), 'rps')
+        if rps > Config.HTTP_STRESS_MAX_RPS:
+            raise ValueError(f"rps must be between 0 and {Config.HTTP_STRESS_MAX_RPS}")
+        
+        concurrency = data.get('concurrency', Config.HTTP_STRESS_CONCURRENCY)
+        if not isinstance(concurrency, int) or isinstance(concurrency, bool) \
+                or not 0 < concurrency <= Config.HTTP_STRESS_MAX_CONCURRENCY:
+            raise ValueError(f"concurrency must be between 1 and {Config.HTTP_STRESS_MAX_CONCURRENCY}")
+        
+        return {
+            'targets': normalized,
+            'rps': rps,
+            'concurrency': concurrency,
+            'timeout': positive_number(data.get('timeout', Config.HTTP_STRESS_TIMEOUT), 'timeout')
+        }
+    
+    def _find_target(self, allowed, key):
+        """Look up a configured target by index, URL or host name"""
+        if isinstance(key, int) and not isinstance(key, bool):
+            if 0 <= key < len(allowed):
+                return allowed[key]
+        elif isinstance(key, str):
+            for target in allowed:
+                if key in (target['url'], urlparse(target['url']).hostname):
+                    return target
+        else:
+            raise ValueError(f"Target must be a name, URL or index: {key!r}")
+        raise ValueError(f"Unknown target {key!r}; choose from HTTP_STRESS_TARGETS")
+    
+    def prepare(self):
+        """Clear an earlier stop before a new run; stops from now on are honoured"""
+        self._stop_event.clear()
+    
+    def stop_requested(self):
+        """Whether stop_stress was called since the last prepare"""
+        return self._stop_event.is_set()
+    
+    def start_stress(self, stress_type, duration, options=None):
+        """Start stress test; call prepare() first"""
         try:
-            logger.info(f"Starting {stress_type} stress test for {duration} seconds")
+            logger.info("Starting %s stress test for %s seconds", stress_type, duration)
             self.stress_active = True
             
             if stress_type == 'cpu':
@@ -24,11 +156,13 @@ class StressService:
                 self._start_memory_stress(duration)
             elif stress_type == 'mixed':
                 self._start_mixed_stress(duration)
+            elif stress_type == 'http':
+                self._start_http_stress(duration, options or self.validate_options('http', {}))
             else:
                 raise ValueError(f"Unknown stress type: {stress_type}")
                 
         except Exception as e:
-            logger.error(f"Error starting stress test: {str(e)}")
+            logger.error("Error starting stress test: %s", e)
             self.stress_active = False
             raise
     
@@ -45,13 +179,10 @@ class StressService:
         
         # Start one thread per CPU core
         for _ in range(num_cores):
-            thread = threading.Thread(target=cpu_stress_worker)
-            thread.daemon = True
-            thread.start()
-            self.stress_threads.append(thread)
+            self.spawn_worker('cpu', cpu_stress_worker)
         
         # Wait for completion
-        time.sleep(duration)
+        self._stop_event.wait(duration)
         self.stress_active = False
         logger.info("CPU stress test completed")
     
@@ -66,7 +197,7 @@ class StressService:
                     # Allocate 100MB blocks
                     block = bytearray(100 * 1024 * 1024)  # 100MB
                     memory_blocks.append(block)
-                    time.sleep(1)  # Pause between allocations
+                    self._stop_event.wait(1)  # Pause between allocations
                     
                     # Prevent unlimited memory growth
                     if len(memory_blocks) > 20:  # Limit to ~2GB
@@ -77,12 +208,9 @@ class StressService:
                 # Clean up
                 memory_blocks.clear()
         
-        thread = threading.Thread(target=memory_stress_worker)
-        thread.daemon = True
-        thread.start()
-        self.stress_threads.append(thread)
+        self.spawn_worker('memory', memory_stress_worker)
         
-        time.sleep(duration)
+        self._stop_event.wait(duration)
         self.stress_active = False
         logger.info("Memory stress test completed")
     
@@ -106,7 +234,7 @@ class StressService:
                 while time.time() < end_time and self.stress_active:
                     block = bytearray(50 * 1024 * 1024)  # 50MB blocks
                     memory_blocks.append(block)
-                    time.sleep(2)  # Slower allocation
+                    self._stop_event.wait(2)  # Slower allocation
                     
                     if len(memory_blocks) > 10:  # Limit to ~500MB
                         memory_blocks.pop(0)
@@ -117,32 +245,56 @@ class StressService:
         
         # Start CPU stress threads
         for _ in range(num_cores):
-            thread = threading.Thread(target=cpu_stress_worker)
-            thread.daemon = True
-            thread.start()
-            self.stress_threads.append(thread)
+            self.spawn_worker('cpu', cpu_stress_worker)
         
         # Start memory stress thread
-        thread = threading.Thread(target=memory_stress_worker)
-        thread.daemon = True
-        thread.start()
-        self.stress_threads.append(thread)
+        self.spawn_worker('memory', memory_stress_worker)
         
-        time.sleep(duration)
+        self._stop_event.wait(duration)
         self.stress_active = False
         logger.info("Mixed stress test completed")
     
+    def _start_http_stress(self, duration, options):
+        """Start HTTP load against other services at a constant arrival rate"""
+        generator = HttpLoadGenerator(
+            targets=options['targets'],
+            rps=options['rps'],
+            concurrency=options['concurrency'],
+            timeout=options['timeout'],
+            max_backlog=Config.HTTP_STRESS_MAX_BACKLOG
+        )
+        self.http_load = generator
+        
+        workers = [self.spawn_worker('http', generator.work, self._stop_event)
+                   for _ in range(options['concurrency'])]
+        generator.dispatch(duration, self._stop_event)
+        
+        # Let in-flight requests finish so the tail is counted
+        deadline = time.time() + options['timeout'] + 1
+        for thread in workers:
+            thread.join(timeout=max(0, deadline - time.time()))
+        
+        self.stress_active = False
+        logger.info("HTTP stress test completed")
+    
+    def get_http_stats(self):
+        """Stats of the current or most recent HTTP stress run"""
+        return self.http_load.stats() if self.http_load else None
+    
     def stop_stress(self):
         """Stop all stress tests"""
         logger.info("Stopping stress tests")
         self.stress_active = False
+        self._stop_event.set()
         
-        # Wait for threads to complete
-        for thread in self.stress_threads:
-            if thread.is_alive():
+        # Wait for load threads to complete; each one unregisters itself on exit.
+        # Runners only wind down and report, so they are not waited for.
+        with self._workers_lock:
+            threads = [info['thread'] for info in self.stress_workers.values()
+                       if info['type'] != 'runner']
+        for thread in threads:
+            if thread.is_alive() and thread is not threading.current_thread():
                 thread.join(timeout=1)
-        
-        self.stress_threads.clear()
     
     def get_current_metrics(self):
         """Get current system metrics"""
@@ -161,11 +313,12 @@ class StressService:
                 'memory_used_gb': round(memory.used / (1024**3), 2),
                 'memory_available_gb': round(memory.available / (1024**3), 2),
                 'load_average': load_avg,
-                'active_stress': self.stress_active
+                'active_stress': self.stress_active,
+                'http': self.get_http_stats()
             }
             
         except Exception as e:
-            logger.error(f"Error getting current metrics: {str(e)}")
+            logger.error("Error getting current metrics: %s", e)
             return {
                 'cpu_percent': 0,
                 'memory_percent': 0,
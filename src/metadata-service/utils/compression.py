@@ -0,0 +1,91 @@
+import gzip
+
+from flask import request
+
+from config.settings import Config
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/plain', 'text/html')
+
+
+def _accepted_encodings(header):
+    """Parse Accept-Encoding into {encoding: q}"""
+    accepted = {}
+    for part in header.split(','):
+        token, _, params = part.strip().partition(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token] = q
+    return accepted
+
+
+def negotiate_encoding(header):
+    """Pick the best supported encoding for an Accept-Encoding header"""
+    if not header:
+        return None
+
+    accepted = _accepted_encodings(header)
+    wildcard = accepted.get('*', 0.0)
+    candidates = ['br', 'gzip'] if brotli is not None else ['gzip']
+
+    best, best_q = None, 0.0
+    for encoding in candidates:
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body, encoding):
+    """Compress a body with the given encoding"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=Config.BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=Config.GZIP_LEVEL, mtime=0)
+
+
+def compress_response(response):
+    """after_request hook compressing large responses per Accept-Encoding"""
+    if not Config.COMPRESSION_ENABLED:
+        return response
+
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    body = response.get_data()
+    if len(body) < Config.COMPRESSION_MIN_SIZE:
+        return response
+
+    encoding = negotiate_encoding(request.headers.get('Accept-Encoding', ''))
+    if encoding is None:
+        return response
+
+    # Reuse compressed bytes for cached payloads
+    encoded = getattr(response, 'encoded_payload', None)
+    if encoded is not None and encoded.envelope == body:
+        compressed = encoded.compressed.get(encoding)
+        if compressed is None:
+            compressed = compress(body, encoding)
+            encoded.compressed[encoding] = compressed
+    else:
+        compressed = compress(body, encoding)
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    return response
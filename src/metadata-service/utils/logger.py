@@ -1,26 +1,187 @@
+import atexit
+import json
 import logging
+import os
+import queue
 import sys
+import threading
+import time
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
+from config.settings import Config
+
+# Attributes every LogRecord has; anything else was passed via extra=
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'suppressed'}
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as one JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            'timestamp': datetime.utcfromtimestamp(record.created).isoformat(timespec='milliseconds') + 'Z',
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'process': record.process,
+            'thread': record.threadName
+        }
+        if getattr(record, 'suppressed', 0):
+            entry['suppressed_since_last'] = record.suppressed
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """Let through at most `limit` records per call site per `window` seconds
+
+    Call sites are keyed by logger, file and line rather than by message, so
+    f-string messages that differ per call are still grouped together.
+    """
+
+    def __init__(self, limit, window):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self.suppressed = 0
+        self._sites = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if self.limit <= 0:
+            return True
+
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None or now - site[0] >= self.window:
+                # New window: report what the previous one swallowed
+                record.suppressed = site[2] if site else 0
+                self._sites[key] = [now, 1, 0]
+                return True
+            if site[1] < self.limit:
+                site[1] += 1
+                return True
+            site[2] += 1
+            self.suppressed += 1
+            return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Hand records to the writer thread, dropping them when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Message formatting happens on the writer thread, not the caller's
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+
+def _build_stream_handler():
+    """Create the single stdout handler used by the writer thread"""
+    handler = logging.StreamHandler(sys.stdout)
+    if Config.LOG_FORMAT == 'json':
+        handler.setFormatter(JSONFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        ))
+    return handler
+
+
+def _parse_levels(spec):
+    """Parse 'logger=LEVEL,logger=LEVEL' into a dict"""
+    levels = {}
+    for item in spec.split(','):
+        name, _, level = item.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+_log_queue = queue.Queue(maxsize=Config.LOG_QUEUE_SIZE)
+_queue_handler = NonBlockingQueueHandler(_log_queue)
+_rate_limiter = RateLimitFilter(Config.LOG_RATE_LIMIT, Config.LOG_RATE_WINDOW)
+_queue_handler.addFilter(_rate_limiter)
+_levels = _parse_levels(Config.LOG_LEVELS)
+_listener = None
+
+
+def _start_listener():
+    """Start the background writer thread for this process"""
+    global _listener
+    _listener = QueueListener(_log_queue, _build_stream_handler(), respect_handler_level=False)
+    _listener.start()
+
+
+def _restart_after_fork():
+    """Threads do not survive fork(); give each worker its own writer"""
+    global _log_queue, _listener
+    _log_queue = queue.Queue(maxsize=Config.LOG_QUEUE_SIZE)
+    _queue_handler.queue = _log_queue
+    _queue_handler.enqueued = _queue_handler.dropped = 0
+    _listener = None
+    _start_listener()
+
+
+def _stop_listener():
+    """Flush queued records on interpreter exit"""
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+
+
+_start_listener()
+atexit.register(_stop_listener)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def get_level(name):
+    """Level for a logger: the most specific LOG_LEVELS entry, else LOG_LEVEL"""
+    parts = name.split('.')
+    for i in range(len(parts), 0, -1):
+        level = _levels.get('.'.join(parts[:i]))
+        if level:
+            return level
+    return Config.LOG_LEVEL.upper()
+
+
+def get_log_stats():
+    """Counters for the logging pipeline"""
+    return {
+        'levels': {'default': Config.LOG_LEVEL.upper(), **_levels},
+        'enqueued': _queue_handler.enqueued,
+        'dropped': _queue_handler.dropped,
+        'rate_limited': _rate_limiter.suppressed,
+        'queue_depth': _log_queue.qsize(),
+        'queue_size': Config.LOG_QUEUE_SIZE
+    }
+
 
 def setup_logger(name):
-    """Setup logger with proper formatting"""
+    """Setup logger writing through the shared non-blocking queue"""
     logger = logging.getLogger(name)
-    
+
     if logger.hasHandlers():
         return logger
-        
-    logger.setLevel(logging.INFO)
-    
-    # Create console handler
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setLevel(logging.INFO)
-    
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    handler.setFormatter(formatter)
-    
-    logger.addHandler(handler)
+
+    logger.setLevel(get_level(name))
+    logger.addHandler(_queue_handler)
     return logger
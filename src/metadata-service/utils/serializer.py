@@ -0,0 +1,161 @@
+import hashlib
+import json
+import threading
+from datetime import date, datetime
+
+from flask import Response, request
+from flask.json.provider import DefaultJSONProvider
+
+from config.settings import Config
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library encoder
+    orjson = None
+
+MIMETYPE = 'application/json'
+
+
+def _default(obj):
+    """Encode values the JSON backends do not handle natively"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    return str(obj)
+
+
+def backend_name():
+    """Name of the JSON backend in use"""
+    if orjson is not None and Config.JSON_SERIALIZER == 'orjson':
+        return 'orjson'
+    return 'json'
+
+
+def dumps(obj):
+    """Serialize an object to UTF-8 JSON bytes"""
+    if backend_name() == 'orjson':
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_default, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data):
+    """Deserialize JSON bytes or text"""
+    if backend_name() == 'orjson':
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by the fast serializer"""
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=MIMETYPE)
+
+
+class EncodedPayload:
+    """Serialized payload bytes, its response envelope and compressed variants
+
+    The envelope is encoded once, stamped with encoded_at rather than a
+    per-request timestamp, so whole response bodies and their gzip or brotli
+    variants can be reused for as long as the payload is unchanged.
+    """
+
+    def __init__(self, body):
+        self.body = body
+        self.encoded_at = datetime.utcnow().isoformat() + 'Z'
+        self.envelope = None
+        self.compressed = {}
+        self._etag = None
+
+    @property
+    def etag(self):
+        """Content hash of the serialized payload"""
+        if self._etag is None:
+            self._etag = hashlib.blake2b(self.body, digest_size=16).hexdigest()
+        return self._etag
+
+
+class PayloadCache:
+    """Cache serialized bytes of payloads that are themselves cached
+
+    An entry is reused for as long as the caller passes the very same payload
+    object, so a cache hit upstream turns into an encoding hit here.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, payload):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is payload:
+            return entry[1]
+
+        body = dumps(payload)
+        if entry is not None and entry[1].body == body:
+            # Refetched but unchanged: keep the ETag and compressed variants
+            encoded = entry[1]
+        else:
+            encoded = EncodedPayload(body)
+        with self._lock:
+            self._entries[key] = (payload, encoded)
+        return encoded
+
+
+payload_cache = PayloadCache()
+
+
+def json_response(payload, status=200):
+    """Build a JSON response"""
+    return Response(dumps(payload), status=status, mimetype=MIMETYPE)
+
+
+def envelope_response(data, status=200, cache_key=None, **fields):
+    """Build a {**fields, 'data': ...} response
+
+    With a cache_key, fields must be constant for the key: the whole body is
+    encoded once per cached payload, with an 'encoded_at' time instead of a
+    per-request timestamp (the Date header carries the response time), and
+    reused together with its compressed variants. Cached
+    responses carry an ETag and answer a matching If-None-Match with 304.
+    """
+    if cache_key is None:
+        return json_response({**fields, 'data': data}, status)
+
+    encoded = payload_cache.get(cache_key, data)
+    if status == 200 and request.if_none_match.contains_weak(encoded.etag):
+        return not_modified(encoded.etag)
+
+    if encoded.envelope is None:
+        head = dumps({**fields, 'encoded_at': encoded.encoded_at})
+        encoded.envelope = head[:-1] + b',"data":' + encoded.body + b'}'
+    response = Response(encoded.envelope, status=status, mimetype=MIMETYPE)
+    response.encoded_payload = encoded
+    if status == 200:
+        _set_validators(response, encoded.etag)
+    return response
+
+
+def not_modified(etag):
+    """Build an empty 304 response for a matching ETag"""
+    response = Response(status=304)
+    _set_validators(response, etag)
+    return response
+
+
+def _set_validators(response, etag):
+    """Attach the ETag and Cache-Control headers for conditional GETs
+
+    The ETag covers only the cached data member, not the envelope, whose
+    encoded_at differs between workers, so the tag is weak.
+    """
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = Config.METADATA_CACHE_CONTROL